@@ -0,0 +1 @@
+"""Offline benchmarks of the Steam Web API Client."""
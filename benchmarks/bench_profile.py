@@ -0,0 +1,262 @@
+"""Benchmark opening profiles against the local stub server.
+
+Runs the data path of the response window headlessly: summary and recently
+played games in parallel, the avatar and all icons through the image
+pipeline. Nothing leaves the machine.
+
+Usage:
+    python -m benchmarks.bench_profile --profiles 50 --latency 0.02
+    python -m benchmarks.bench_profile --error-rate 0.05 --save baseline.json
+    python -m benchmarks.bench_profile --baseline baseline.json
+    python -m benchmarks.bench_profile --record session.swar
+    python -m benchmarks.bench_profile --replay session.swar --no-delay
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_server import StubSteamServer
+from steam_web_api_client.core.media_cache import MediaCache
+from steam_web_api_client.core.rate_limiter import RetryPolicy
+from steam_web_api_client.core.response_cache import ResponseCache
+from steam_web_api_client.core.session_archive import SessionArchive
+from steam_web_api_client.core.steam_api import SteamAPI
+from steam_web_api_client.core.transport import HTTPTransport
+
+FIRST_STEAM_ID = 76561198000000000
+
+
+def open_profile(steam_api: SteamAPI, steamid: str) -> float:
+    """Fetch everything the response window shows for a profile.
+
+    Args:
+        steam_api (SteamAPI): client used for the API calls
+        steamid (str): steam ID of the user
+
+    Returns:
+        float: seconds until the last icon was ready
+    """
+    start = time.perf_counter()
+    games, _ = steam_api.get_profile(steamid=steamid, on_avatar=lambda avatar: None)
+    if games and games["response"]:
+        table = steam_api.fetch_games(games)
+        for _ in steam_api.iter_icons(table):
+            pass
+    return time.perf_counter() - start
+
+
+def percentile(values: list, share: float) -> float:
+    """Return a percentile using the nearest rank.
+
+    Args:
+        values (list): measured values
+        share (float): percentile between 0 and 1
+
+    Returns:
+        float: the value at the percentile, or 0.0 without values
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(share * len(ordered)) - 1)]
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Run the benchmark.
+
+    Args:
+        args (argparse.Namespace): parsed command line arguments
+
+    Returns:
+        dict: measured results
+    """
+    with contextlib.ExitStack() as stack:
+        cache_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        if args.replay:
+            # Nothing is served, the responses come from the archive
+            server = None
+            archive = SessionArchive(args.replay, mode="r")
+        else:
+            server = stack.enter_context(
+                StubSteamServer(
+                    latency=args.latency, error_rate=args.error_rate, games=args.games
+                )
+            )
+            archive = SessionArchive(args.record, mode="w") if args.record else None
+        if archive is not None:
+            stack.callback(archive.close)
+        steam_api = SteamAPI(
+            api_key="0" * 32,
+            max_workers=args.workers,
+            transport=HTTPTransport(
+                pool_size=args.workers,
+                requests_per_second=args.rate,
+                retry_policy=RetryPolicy(base_delay=0.05, max_delay=1.0),
+                host_overrides=server.host_overrides if server else None,
+                archive=archive,
+                latency_scale=0.0 if args.no_delay else 1.0,
+            ),
+            media_cache=MediaCache(cache_dir) if args.cache else None,
+            response_cache=ResponseCache() if args.cache else None,
+        )
+        stack.callback(steam_api.transport.close)
+        if server:
+            server.reset_counters()
+        steam_ids = [
+            str(FIRST_STEAM_ID + index % args.distinct)
+            for index in range(args.profiles)
+        ]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            latencies = list(
+                executor.map(
+                    lambda steamid: open_profile(steam_api, steamid), steam_ids
+                )
+            )
+        elapsed = time.perf_counter() - start
+
+    requests = server.requests if server else 0
+    return {
+        "profiles": len(latencies),
+        "seconds": elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "profiles_per_second": len(latencies) / elapsed,
+        "requests": requests,
+        "requests_per_second": requests / elapsed,
+        "errors": server.errors if server else 0,
+        "bytes": server.bytes_sent if server else 0,
+        "coalesced": steam_api.api_calls.coalesced + steam_api.media_fetches.coalesced,
+        "stages": steam_api.image_pipeline.timings.as_dict(),
+    }
+
+
+def check_regression(result: dict, baseline: dict, tolerance: float) -> list:
+    """Compare a result with a saved baseline.
+
+    Args:
+        result (dict): measured results
+        baseline (dict): results of an earlier run
+        tolerance (float): allowed relative slowdown, e.g. 0.1 for 10%
+
+    Returns:
+        list: descriptions of the regressions, empty if there are none
+    """
+    regressions = []
+    for name in ("p50_ms", "p95_ms"):
+        if result[name] > baseline[name] * (1 + tolerance):
+            regressions.append(
+                f"{name} {result[name]:.1f} > {baseline[name]:.1f} (+{tolerance:.0%})"
+            )
+    if result["profiles_per_second"] < baseline["profiles_per_second"] * (
+        1 - tolerance
+    ):
+        regressions.append(
+            f"profiles_per_second {result['profiles_per_second']:.1f} < "
+            f"{baseline['profiles_per_second']:.1f} (-{tolerance:.0%})"
+        )
+    return regressions
+
+
+def print_result(result: dict) -> None:
+    """Print the results in a readable form.
+
+    Args:
+        result (dict): measured results
+    """
+    print(
+        f"{result['profiles']} profiles in {result['seconds']:.2f}s "
+        f"({result['profiles_per_second']:.1f}/s)"
+    )
+    print(f"latency p50 {result['p50_ms']:.1f}ms  p95 {result['p95_ms']:.1f}ms")
+    print(
+        f"{result['requests']} requests ({result['requests_per_second']:.1f}/s), "
+        f"{result['errors']} errors, {result['bytes'] / 1024:.1f} KiB, "
+        f"{result['coalesced']} coalesced"
+    )
+    for stage, timing in result["stages"].items():
+        print(f"  {stage:<7} {timing['count']:>6}x  mean {timing['mean_ms']:.3f}ms")
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Args:
+        argv (list): arguments, defaults to sys.argv
+
+    Returns:
+        argparse.Namespace: parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_profile",
+        description="Benchmark opening profiles against a local stub server.",
+    )
+    parser.add_argument("--profiles", type=int, default=50)
+    parser.add_argument(
+        "--distinct", type=int, default=None, help="distinct steam IDs to cycle"
+    )
+    parser.add_argument("--games", type=int, default=20, help="games per profile")
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("-w", "--workers", type=int, default=8)
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=1, help="profiles opened at once"
+    )
+    parser.add_argument("--rate", type=float, default=1000)
+    parser.add_argument(
+        "--cache", action="store_true", help="use response and media cache"
+    )
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument("--record", help="record the responses into an archive")
+    archive.add_argument("--replay", help="replay an archive instead of the stub")
+    parser.add_argument(
+        "--no-delay", action="store_true", help="replay without recorded latencies"
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--save", help="write the results to a JSON file")
+    parser.add_argument("--baseline", help="JSON file of an earlier run to compare")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+    args.distinct = args.distinct or args.profiles
+    return args
+
+
+def main(argv: list = None) -> int:
+    """Run the benchmark and compare it with a baseline.
+
+    Args:
+        argv (list): command line arguments, defaults to sys.argv
+
+    Returns:
+        int: 1 if the results regressed, otherwise 0
+    """
+    args = parse_args(argv)
+    # Keep retry warnings of the client off the results
+    with contextlib.redirect_stdout(sys.stderr):
+        result = run(args)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_result(result)
+    if args.save:
+        with open(file=args.save, mode="w", encoding="utf-8") as result_file:
+            json.dump(result, result_file, indent=2)
+    if args.baseline:
+        with open(file=args.baseline, mode="r", encoding="utf-8") as baseline_file:
+            regressions = check_regression(
+                result, json.load(baseline_file), args.tolerance
+            )
+        for regression in regressions:
+            print(f"[WARNING] Regression: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""Local HTTP server answering like the Steam Web API and the media hosts."""
+
+import hashlib
+import io
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from PIL import Image
+
+STEAM_HOSTS = (
+    "api.steampowered.com",
+    "media.steampowered.com",
+    "avatars.steamstatic.com",
+)
+
+
+class StubSteamServer:
+    # pylint: disable=too-many-instance-attributes
+    """Serve canned API responses, icons and avatars on localhost.
+
+    Responses are generated from the requested steam ID, so the same profile
+    always looks the same. Every request waits latency seconds and fails with
+    503 at error_rate, the first request of a retry included.
+
+    Attributes:
+        latency: A float holding the delay of every response in seconds
+        error_rate: A float holding the share of requests answered with 503
+        games: An integer holding the amount of games per profile
+        requests: An integer counting the handled requests
+        errors: An integer counting the requests answered with 503
+        bytes_sent: An integer counting the sent bytes of all response bodies
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        games: int = 20,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.games = games
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._image = create_jpeg((32, 32))
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self.create_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base url of the server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def host_overrides(self) -> dict:
+        """Mapping of the Steam hosts to the server for HTTPTransport."""
+        return dict.fromkeys(STEAM_HOSTS, self.url)
+
+    def start(self) -> "StubSteamServer":
+        """Serve requests on a background thread.
+
+        Returns:
+            StubSteamServer: the started server
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset_counters(self) -> None:
+        """Set the request, error and byte counters to 0."""
+        with self._lock:
+            self.requests = 0
+            self.errors = 0
+            self.bytes_sent = 0
+
+    def count_bytes(self, amount: int) -> None:
+        """Add sent bytes to bytes_sent.
+
+        Args:
+            amount (int): amount of sent bytes
+        """
+        with self._lock:
+            self.bytes_sent += amount
+
+    def respond(self, path: str, query: dict) -> tuple:
+        """Build the response of a request.
+
+        Args:
+            path (str): path of the request
+            query (dict): parsed query parameters
+
+        Returns:
+            tuple: status code, content type and body
+        """
+        with self._lock:
+            self.requests += 1
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            return 503, "text/plain", b"Service Unavailable"
+
+        if path.endswith(".jpg"):
+            return 200, "image/jpeg", self._image
+        if path.startswith("/ISteamUser/GetPlayerSummaries/"):
+            body = self.get_player_summaries(query["steamids"][0].split(","))
+        elif path.startswith("/ISteamUser/ResolveVanityURL/"):
+            body = self.resolve_vanity_url(query["vanityurl"][0])
+        elif path.startswith("/ISteamUser/GetFriendList/"):
+            body = self.get_friend_list(query["steamid"][0])
+        elif path.startswith("/IPlayerService/GetOwnedGames/"):
+            body = self.get_owned_games(query["steamid"][0])
+        elif path.startswith("/IPlayerService/GetRecentlyPlayedGames/"):
+            body = self.get_recently_played_games(query["steamid"][0])
+        else:
+            return 404, "text/plain", b"Not Found"
+        return 200, "application/json", json.dumps(body).encode("utf-8")
+
+    def get_player_summaries(self, steamids: list) -> dict:
+        """Build the summaries of users.
+
+        Args:
+            steamids (list): steam IDs of the users
+
+        Returns:
+            dict: response of GetPlayerSummaries
+        """
+        players = []
+        for steamid in steamids:
+            avatar_hash = hashlib.sha1(steamid.encode("ascii")).hexdigest()
+            players.append(
+                {
+                    "steamid": steamid,
+                    "personaname": f"user{steamid[-4:]}",
+                    "personastate": int(steamid) % 5,
+                    "lastlogoff": 1700000000 + int(steamid) % 86400,
+                    "avatar": f"https://avatars.steamstatic.com/{avatar_hash}.jpg",
+                }
+            )
+        return {"response": {"players": players}}
+
+    def resolve_vanity_url(self, vanity_name: str) -> dict:
+        """Resolve the names of get_player_summaries(), e.g. user0042.
+
+        Args:
+            vanity_name (str): custom url name of an user profile
+
+        Returns:
+            dict: response of ResolveVanityURL
+        """
+        if vanity_name.startswith("user") and vanity_name[4:].isdigit():
+            steamid = 76561198000000000 + int(vanity_name[4:])
+            return {"response": {"steamid": str(steamid), "success": 1}}
+        return {"response": {"success": 42, "message": "No match"}}
+
+    def get_friend_list(self, steamid: str) -> dict:
+        """Build the friend list of an user.
+
+        Friendships are generated from the steam ID, so friend lists of
+        different users overlap like in a real network.
+
+        Args:
+            steamid (str): steam ID of the user
+
+        Returns:
+            dict: response of GetFriendList
+        """
+        friends = [
+            {
+                "steamid": str(int(steamid) + offset),
+                "relationship": "friend",
+                "friend_since": 1600000000,
+            }
+            for offset in (-7, -3, -1, 1, 3, 7)
+        ]
+        return {"friendslist": {"friends": friends}}
+
+    def get_recently_played_games(self, steamid: str) -> dict:
+        """Build the recently played games of an user.
+
+        Args:
+            steamid (str): steam ID of the user
+
+        Returns:
+            dict: response of GetRecentlyPlayedGames
+        """
+        games = []
+        for index in range(self.games):
+            appid = 10 * (int(steamid) % 1000 + index + 1)
+            games.append(
+                {
+                    "appid": appid,
+                    "name": f"Game {appid}",
+                    "playtime_2weeks": (appid * 7) % 600,
+                    "playtime_forever": (appid * 31) % 60000,
+                    "img_icon_url": hashlib.sha1(str(appid).encode()).hexdigest(),
+                }
+            )
+        return {"response": {"total_count": len(games), "games": games}}
+
+    def get_owned_games(self, steamid: str) -> dict:
+        """Build the library of an user, ten times as large as the recent games.
+
+        Args:
+            steamid (str): steam ID of the user
+
+        Returns:
+            dict: response of GetOwnedGames without appinfo
+        """
+        games = []
+        for index in range(self.games * 10):
+            appid = 10 * (int(steamid) % 1000 + index + 1)
+            games.append(
+                {
+                    "appid": appid,
+                    "playtime_forever": (appid * 31) % 60000 if index % 3 else 0,
+                    "rtime_last_played": 1700000000 - appid,
+                }
+            )
+        return {"response": {"game_count": len(games), "games": games}}
+
+    def create_handler(self) -> type:
+        """Create the request handler class bound to this server.
+
+        Returns:
+            type: subclass of BaseHTTPRequestHandler
+        """
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Answer GET requests with the responses of the stub."""
+
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, don't wait for ACKs
+            disable_nagle_algorithm = True
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Send the response of the stub."""
+                url = urlparse(self.path)
+                status, content_type, body = stub.respond(url.path, parse_qs(url.query))
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                stub.count_bytes(len(body))
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                """Keep the output of the benchmark clean."""
+
+        return Handler
+
+
+def create_jpeg(size: tuple) -> bytes:
+    """Encode a plain image as JPEG.
+
+    Args:
+        size (tuple): width and height in pixels
+
+    Returns:
+        bytes: the encoded image
+    """
+    data = io.BytesIO()
+    Image.new("RGB", size, (27, 40, 56)).save(data, "JPEG")
+    return data.getvalue()
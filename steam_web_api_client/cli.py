@@ -0,0 +1,531 @@
+"""Steam Web API Client - headless batch mode
+
+Fetches profiles for many steam IDs without a graphical interface and streams
+one JSON line or CSV row per profile as soon as it has been fetched.
+
+Usage:
+    python -m steam_web_api_client.cli 7656119... 7656119...
+    python -m steam_web_api_client.cli https://steamcommunity.com/id/name/ name
+    python -m steam_web_api_client.cli --file ids.txt --format csv
+    python -m steam_web_api_client.cli --owned --saved
+    python -m steam_web_api_client.cli --file ids.txt --compare overlap.json
+    python -m steam_web_api_client.cli --file ids.txt --record session.swar
+    python -m steam_web_api_client.cli --file ids.txt --replay session.swar --no-delay
+    cat ids.txt | python -m steam_web_api_client.cli
+    python -m steam_web_api_client.cli --friends 2 7656119... > friends.jsonl
+
+Does not import tkinter or Pillow.
+"""
+
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, TextIO
+
+import numpy as np
+
+from steam_web_api_client.core import parsing
+from steam_web_api_client.core import friends_crawler
+from steam_web_api_client.core.data_handler import DataHandler
+from steam_web_api_client.core.game_table import GameTable
+from steam_web_api_client.core.library_analytics import Library
+from steam_web_api_client.core.library_compare import LibraryComparison
+from steam_web_api_client.core.metrics import DEFAULT_METRICS, Metrics
+from steam_web_api_client.core.playtime_history import PlaytimeHistory
+from steam_web_api_client.core.session_archive import SessionArchive
+from steam_web_api_client.core.steam_api import SteamAPI
+from steam_web_api_client.core.transport import HTTPTransport
+from steam_web_api_client.core.vanity_resolver import VanityResolver
+
+FIELDS = (
+    "steam_id",
+    "username",
+    "status",
+    "last_logoff",
+    "avatar_url",
+    "game_count",
+    "playtime_2weeks",
+    "playtime_forever",
+    "error",
+)
+# Fields of the whole library fetched with --owned
+LIBRARY_FIELDS = FIELDS[:-1] + (
+    "never_played",
+    "playtime_median",
+    "playtime_p90",
+    "error",
+)
+
+
+def read_steam_ids(args: argparse.Namespace, data_handler: DataHandler) -> Iterator:
+    """Yield steam IDs from the arguments, a file, data.json or stdin.
+
+    Blank lines and lines starting with # are skipped.
+
+    Args:
+        args (argparse.Namespace): parsed command line arguments
+        data_handler (DataHandler): handler holding the steam IDs of data.json
+
+    Yields:
+        str: steam ID
+    """
+    if args.steam_ids:
+        lines = iter(args.steam_ids)
+    elif args.saved:
+        lines = iter(data_handler.id_list)
+    elif args.file and args.file != "-":
+        with open(file=args.file, mode="r", encoding="utf-8") as id_file:
+            yield from read_steam_ids_from(id_file)
+        return
+    else:
+        lines = sys.stdin
+    yield from read_steam_ids_from(lines)
+
+
+def read_steam_ids_from(lines) -> Iterator:
+    """Yield the steam IDs of an iterable of lines.
+
+    Args:
+        lines: iterable of strings holding one steam ID each
+
+    Yields:
+        str: steam ID
+    """
+    for line in lines:
+        steam_id = line.strip()
+        if steam_id and not steam_id.startswith("#"):
+            yield steam_id
+
+
+def resolve_steam_ids(
+    resolver: VanityResolver, identifiers: Iterator, batch_size: int = 1000
+) -> Iterator:
+    """Yield the steam IDs of steam IDs, profile urls and vanity names.
+
+    Identifiers are resolved in batches, so names repeated within a batch
+    are requested only once. Unresolvable identifiers are skipped.
+
+    Args:
+        resolver (VanityResolver): resolves vanity names
+        identifiers (Iterator): steam IDs, profile urls and vanity names
+        batch_size (int): amount of identifiers resolved at once
+
+    Yields:
+        str: steam ID
+    """
+    identifiers = iter(identifiers)
+    while batch := list(itertools.islice(identifiers, batch_size)):
+        for identifier, steam_id in resolver.resolve_many(batch):
+            if steam_id is None:
+                print(f"[WARNING] Couldn't resolve {identifier}")
+            else:
+                yield steam_id
+
+
+def data_file(args: argparse.Namespace, name: str) -> str:
+    """Return the path of a file kept next to data.json.
+
+    Args:
+        args (argparse.Namespace): parsed command line arguments
+        name (str): name of the file
+
+    Returns:
+        str: path of the file, its directory is created if needed
+    """
+    directory = os.path.dirname(args.data)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, name)
+
+
+def fetch_record(
+    steam_api: SteamAPI,
+    steam_id: str,
+    history: PlaytimeHistory = None,
+    owned: bool = False,
+    libraries: dict = None,
+) -> dict:
+    """Fetch summary and recently played games of an user.
+
+    Args:
+        steam_api (SteamAPI): client used for the API calls
+        steam_id (str): steam ID of user to fetch information
+        history (PlaytimeHistory): records the playtimes if given
+        owned (bool): fetch and analyse the whole library instead
+        libraries (dict): collects the Library per steam ID if owned
+
+    Returns:
+        dict: flat record with the keys of FIELDS, or LIBRARY_FIELDS if owned
+    """
+    record = dict.fromkeys(LIBRARY_FIELDS if owned else FIELDS)
+    record["steam_id"] = steam_id
+    summary = steam_api.get_player_summaries(steamid=steam_id)
+    # The client returns None when the call failed after retrying
+    if summary is None:
+        record["error"] = "request failed"
+        return record
+    if not summary["response"].get("players"):
+        record["error"] = "profile not found"
+        return record
+    record["username"] = parsing.parse_username(summary)
+    record["status"] = parsing.parse_user_status(summary)
+    record["last_logoff"] = parsing.parse_last_logoff(summary)
+    record["avatar_url"] = summary["response"]["players"][0]["avatar"]
+
+    if owned:
+        return fetch_library(steam_api, record, history, libraries)
+    games = steam_api.get_recently_played_games(steamid=steam_id)
+    if games is None:
+        record["error"] = "request failed"
+        return record
+    if not games["response"]:
+        record["error"] = "games not accessible"
+        return record
+    table = GameTable.from_response(games)
+    if history is not None:
+        history.record(steam_id, table)
+    record["game_count"] = len(table)
+    record["playtime_2weeks"] = table.total_playtime_2weeks
+    record["playtime_forever"] = table.total_playtime_forever
+    return record
+
+
+def fetch_library(
+    steam_api: SteamAPI,
+    record: dict,
+    history: PlaytimeHistory = None,
+    libraries: dict = None,
+) -> dict:
+    """Fill a record with the figures of the whole library of an user.
+
+    Args:
+        steam_api (SteamAPI): client used for the API calls
+        record (dict): record holding the steam ID and the summary
+        history (PlaytimeHistory): records the playtimes if given
+        libraries (dict): collects the Library per steam ID if given
+
+    Returns:
+        dict: the record with the keys of LIBRARY_FIELDS
+    """
+    # Names and icons aren't part of the record, keep the response small
+    games = steam_api.get_owned_games(steamid=record["steam_id"], include_appinfo=False)
+    if games is None:
+        record["error"] = "request failed"
+        return record
+    if not games["response"]:
+        record["error"] = "games not accessible"
+        return record
+    if history is not None:
+        history.record(record["steam_id"], GameTable.from_response(games))
+    library = Library.from_response(games)
+    if libraries is not None:
+        libraries[record["steam_id"]] = library
+    record.update(library.summary())
+    return record
+
+
+def fetch_records(
+    steam_api: SteamAPI,
+    steam_ids: Iterator,
+    workers: int,
+    history: PlaytimeHistory = None,
+    owned: bool = False,
+    libraries: dict = None,
+) -> Iterator:
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    """Fetch records with bounded concurrency, yielding them as they complete.
+
+    At most twice the amount of workers steam IDs are read ahead, so memory
+    stays flat however long the input is.
+
+    Args:
+        steam_api (SteamAPI): client used for the API calls
+        steam_ids (Iterator): steam IDs of users to fetch information
+        workers (int): amount of concurrent lookups
+        history (PlaytimeHistory): records the playtimes if given
+        owned (bool): fetch and analyse the whole libraries instead
+        libraries (dict): collects the Library per steam ID if owned
+
+    Yields:
+        dict: flat record with the keys of FIELDS, or LIBRARY_FIELDS if owned
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for steam_id in steam_ids:
+            pending.add(
+                executor.submit(
+                    fetch_record, steam_api, steam_id, history, owned, libraries
+                )
+            )
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def write_records(
+    records: Iterator, output: TextIO, output_format: str, fields: tuple = FIELDS
+) -> None:
+    """Write each record as soon as it arrives.
+
+    Args:
+        records (Iterator): records to write
+        output (TextIO): stream to write to
+        output_format (str): "jsonl" or "csv"
+        fields (tuple): keys of the records, used as csv columns
+    """
+    if output_format == "csv":
+        writer = csv.DictWriter(output, fieldnames=fields)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            output.flush()
+    else:
+        for record in records:
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+
+
+def write_comparison(libraries: dict, path: str, count: int = 50) -> None:
+    """Write the overlap of the libraries of all users as JSON.
+
+    Args:
+        libraries (dict): Library per steam ID
+        path (str): path of the file
+        count (int): amount of most common apps and similar pairs
+    """
+    comparison = LibraryComparison(libraries)
+    similarities = comparison.jaccard()
+    rows, columns = np.triu_indices(len(comparison), k=1)
+    pairs = np.argsort(similarities[rows, columns])[::-1][:count]
+    report = {
+        "users": len(comparison),
+        "apps": len(comparison.appids),
+        "common": comparison.common().tolist(),
+        "most_common": [
+            {
+                "appid": appid,
+                "owners": owners,
+                "playtime_forever": playtime,
+                "top_players": comparison.ranking(appid, count=5),
+            }
+            for appid, owners, playtime in comparison.most_common(count)
+        ],
+        "similar_pairs": [
+            {
+                "steam_ids": [
+                    comparison.steam_ids[rows[pair]],
+                    comparison.steam_ids[columns[pair]],
+                ],
+                "jaccard": float(similarities[rows[pair], columns[pair]]),
+            }
+            for pair in pairs
+        ],
+    }
+    with open(file=path, mode="w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+
+
+def write_metrics(metrics: Metrics, path: str) -> None:
+    """Write metrics as JSON or in the Prometheus text format.
+
+    Args:
+        metrics (Metrics): the metrics to write
+        path (str): path of the file, JSON is written for *.json
+    """
+    with open(file=path, mode="w", encoding="utf-8") as metrics_file:
+        if path.endswith(".json"):
+            metrics_file.write(metrics.to_json())
+        else:
+            metrics_file.write(metrics.to_prometheus())
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Args:
+        argv (list): arguments, defaults to sys.argv
+
+    Returns:
+        argparse.Namespace: parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m steam_web_api_client.cli",
+        description="Fetch Steam profiles without the graphical interface.",
+    )
+    parser.add_argument(
+        "steam_ids", nargs="*", help="steam IDs, profile urls or vanity names"
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        help="file with one steam ID, profile url or vanity name per line, "
+        "- for stdin",
+    )
+    parser.add_argument(
+        "--saved", action="store_true", help="fetch the steam IDs saved in data.json"
+    )
+    parser.add_argument(
+        "--format", choices=("jsonl", "csv"), default="jsonl", dest="output_format"
+    )
+    parser.add_argument("-w", "--workers", type=int, default=8)
+    parser.add_argument(
+        "--rate", type=float, default=10, help="maximum api requests per second"
+    )
+    parser.add_argument(
+        "--api-key", help="steam api key, defaults to $STEAM_API_KEY or data.json"
+    )
+    parser.add_argument(
+        "--data",
+        default=os.path.join("steam_web_api_client", "data", "data.json"),
+        help="path of data.json, the databases data.db and vanity.db are kept "
+        "next to it",
+    )
+    parser.add_argument(
+        "--metrics",
+        help="write metrics of the run to this file, JSON for *.json, "
+        "otherwise the Prometheus text format",
+    )
+    parser.add_argument(
+        "--history",
+        help="SQLite database recording the playtimes of every run, "
+        "e.g. when run periodically by cron",
+    )
+    parser.add_argument(
+        "--owned",
+        action="store_true",
+        help="analyse the whole library instead of the recently played games",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="PATH",
+        help="write the overlap of all libraries as JSON, implies --owned",
+    )
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument(
+        "--record", metavar="PATH", help="record all responses into an archive"
+    )
+    archive.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="answer all requests from a recorded archive, without network",
+    )
+    parser.add_argument(
+        "--no-delay",
+        action="store_true",
+        help="replay without the recorded latencies",
+    )
+    parser.add_argument(
+        "--friends",
+        type=int,
+        metavar="DEPTH",
+        help="crawl the friends of the steam IDs up to DEPTH levels deep "
+        "and write one record per visited user once the crawl is complete",
+    )
+    parser.add_argument(
+        "--crawl-db",
+        help="SQLite database of the friends crawl, an interrupted crawl "
+        "resumes from it, defaults to friends.db next to data.json",
+    )
+    args = parser.parse_args(argv)
+    args.owned = args.owned or bool(args.compare)
+    return args
+
+
+def main(argv: list = None) -> int:
+    """Run the headless batch mode.
+
+    Args:
+        argv (list): command line arguments, defaults to sys.argv
+
+    Returns:
+        int: exit code
+    """
+    args = parse_args(argv)
+    output = sys.stdout
+    # Keep informational prints of the client off the output stream
+    with contextlib.redirect_stdout(sys.stderr), contextlib.ExitStack() as stack:
+        data_handler = DataHandler(data_path=args.data)
+        api_key = args.api_key or os.environ.get("STEAM_API_KEY", "")
+        if not api_key or args.saved:
+            stored_api_key = data_handler.read_data()
+            api_key = api_key or stored_api_key
+        if not api_key and not args.replay:
+            print("[ERROR] No steam api key given!")
+            return 1
+        archive = None
+        if args.record:
+            archive = SessionArchive(args.record, mode="w")
+        elif args.replay:
+            archive = SessionArchive(args.replay, mode="r")
+        if archive is not None:
+            # Also written when the session fails, so it can be replayed
+            stack.callback(archive.close)
+        steam_api = SteamAPI(
+            api_key=api_key,
+            max_workers=args.workers,
+            transport=HTTPTransport(
+                pool_size=args.workers,
+                requests_per_second=args.rate,
+                archive=archive,
+                latency_scale=0.0 if args.no_delay else 1.0,
+            ),
+        )
+        stack.callback(steam_api.transport.close)
+        resolver = VanityResolver(
+            steam_api, data_file(args, "vanity.db"), max_workers=args.workers
+        )
+        stack.callback(resolver.close)
+        steam_ids = resolve_steam_ids(resolver, read_steam_ids(args, data_handler))
+        if args.friends is not None:
+            crawler = friends_crawler.FriendsCrawler(
+                steam_api,
+                args.crawl_db or data_file(args, "friends.db"),
+                max_depth=args.friends,
+                max_workers=args.workers,
+            )
+            stack.callback(crawler.close)
+            write_records(
+                crawler.crawl(steam_ids),
+                output,
+                args.output_format,
+                friends_crawler.FIELDS,
+            )
+        else:
+            history = PlaytimeHistory(args.history) if args.history else None
+            if history is not None:
+                stack.callback(history.close)
+            libraries = {} if args.compare else None
+            records = fetch_records(
+                steam_api,
+                steam_ids,
+                args.workers,
+                history,
+                args.owned,
+                libraries,
+            )
+            write_records(
+                records,
+                output,
+                args.output_format,
+                LIBRARY_FIELDS if args.owned else FIELDS,
+            )
+            if libraries is not None:
+                write_comparison(libraries, args.compare)
+        stack.close()
+        if args.metrics:
+            write_metrics(DEFAULT_METRICS, args.metrics)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
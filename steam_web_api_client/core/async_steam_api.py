@@ -0,0 +1,343 @@
+"""Fetch information from Steam Web API with asyncio"""
+
+import asyncio
+import io
+import json
+from urllib.parse import urlparse
+
+import aiohttp
+from PIL import Image
+
+from steam_web_api_client.core import parsing
+from steam_web_api_client.core.game_table import GameTable
+from steam_web_api_client.core.media_cache import MediaCache
+from steam_web_api_client.core.rate_limiter import (
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+)
+from steam_web_api_client.core.steam_api import ENDPOINTS
+
+
+class AsyncSteamAPI:
+    """Fetch and process information from Steam Web API without blocking.
+
+    All requests share one pooled aiohttp session, so a single event loop can
+    drive many profile lookups at once. Use the client as an async context
+    manager or call close() when done. API calls take a token of the rate
+    limiter first, like the calls of HTTPTransport. Throttled (429), failed
+    (5xx) and broken requests are retried with jittered exponential backoff,
+    honouring Retry-After.
+
+    Attributes:
+        api_key = A string holding the value of the steam api key
+        api_url = A string holding the base url of the Steam Web API
+        max_connections = An integer limiting the amount of pooled connections
+        max_workers = An integer limiting the amount of concurrent icon downloads
+        media_cache = An optional MediaCache storing downloaded icons and avatars
+        timeout = A float holding the timeout of a request in seconds
+        rate_limiter = A TokenBucket shared by all API calls
+        retry_policy = A RetryPolicy deciding about retries of API calls and images
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        max_connections: int = 100,
+        max_workers: int = 8,
+        media_cache: MediaCache = None,
+        timeout: float = 10,
+        requests_per_second: float = 10,
+        retry_policy: RetryPolicy = None,
+    ):
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.api_key = api_key
+        self.api_url = "https://api.steampowered.com"
+        self.max_connections = max_connections
+        self.max_workers = max_workers
+        self.media_cache = media_cache
+        self.timeout = timeout
+        self.rate_limiter = TokenBucket(rate=requests_per_second)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Pooled HTTP session, created on first use inside the event loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the pooled HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def call(self, method: str, **params) -> dict:
+        """Call a method of the Steam Web API in the version of ENDPOINTS.
+
+        Args:
+            method (str): interface and method, e.g. "ISteamUser.GetPlayerSummaries"
+
+        Returns:
+            dict: data containing the fetched information
+        """
+        interface, method_name = method.split(".")
+        version = ENDPOINTS.get(method, 1)
+        url = f"{self.api_url}/{interface}/{method_name}/v{version}/"
+        params = {"key": self.api_key, "format": "json", **params}
+        return json.loads(await self.fetch(url, params=params, rate_limited=True))
+
+    async def fetch(
+        self, url: str, params: dict = None, rate_limited: bool = False
+    ) -> bytes:
+        """Send a GET request, retrying it according to the retry policy.
+
+        Args:
+            url (str): url of the resource
+            params (dict): query parameters of the request
+            rate_limited (bool): take a token of the rate limiter first
+
+        Returns:
+            bytes: content of the response
+        """
+        attempt = 0
+        while True:
+            if rate_limited:
+                await self.rate_limiter.acquire_async()
+            retry_after = None
+            try:
+                async with self.session.get(url, params=params) as response:
+                    if (
+                        not self.retry_policy.should_retry(response.status)
+                        or attempt >= self.retry_policy.max_retries
+                    ):
+                        response.raise_for_status()
+                        return await response.read()
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.retry_policy.max_retries:
+                    raise
+
+            if retry_after is not None and rate_limited:
+                self.rate_limiter.pause(retry_after)
+            delay = self.retry_policy.get_delay(attempt, retry_after)
+            print(f"[WARNING] Retrying {urlparse(url).path} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get_recently_played_games(self, steamid: int) -> dict:
+        """Fetch and return recently played games from API.
+
+        Args:
+            steamid (int): steam ID of user to fetch information
+
+        Returns:
+            dict: data containing the fetched information
+        """
+        try:
+            response = await self.call(
+                "IPlayerService.GetRecentlyPlayedGames", steamid=steamid, count=50
+            )
+
+            if not response["response"]:
+                print("[WARNING] No access to this data! The profile may be private!")
+
+            return response
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as http_err:
+            # Handle HTTP and connection errors, so gathered lookups go on
+            print(f"HTTPError: {http_err}")
+            return None
+
+    async def get_player_summaries(self, steamid: int) -> dict:
+        """Fetch and return summary of an user from API.
+
+        Args:
+            steamid (int): steam ID of user to fetch information
+
+        Returns:
+            dict: data containing the fetched information
+        """
+        try:
+            return await self.call("ISteamUser.GetPlayerSummaries", steamids=steamid)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as http_err:
+            # Handle HTTP and connection errors, so gathered lookups go on
+            print(f"HTTPError: {http_err}")
+            print("No access to this data! The profile may be private!")
+            return None
+
+    async def get_player_summaries_bulk(self, steamids: list) -> dict:
+        """Fetch and return summaries of many users, 100 per request.
+
+        Args:
+            steamids (list): steam IDs of users to fetch information
+
+        Returns:
+            dict: username, status, last logoff and avatar url per steam ID
+        """
+        responses = await asyncio.gather(
+            *(
+                self.get_player_summaries(batch)
+                for batch in parsing.batch_steamids(steamids)
+            )
+        )
+        profiles = {}
+        for summaries in filter(None, responses):
+            profiles.update(parsing.parse_players(summaries))
+        return profiles
+
+    async def get_profile(self, steamid: int) -> tuple:
+        """Fetch recently played games, summary and avatar of an user.
+
+        Both API calls run at the same time, the avatar download starts as
+        soon as the summary arrives.
+
+        Args:
+            steamid (int): steam ID of user to fetch information
+
+        Returns:
+            tuple: recently played games, summary and avatar of the user
+        """
+
+        async def summary_and_avatar():
+            summary = await self.get_player_summaries(steamid)
+            if summary and summary["response"].get("players"):
+                return summary, await self.fetch_avatar(summary)
+            return summary, None
+
+        games, (summary, avatar) = await asyncio.gather(
+            self.get_recently_played_games(steamid), summary_and_avatar()
+        )
+        return games, summary, avatar
+
+    async def fetch_avatar(self, summaries: dict) -> Image.Image:
+        """Fetch and decode the avatar of an user.
+
+        Args:
+            summaries (dict): data containing the fetched information about user
+
+        Returns:
+            Image.Image: decoded avatar, or None if the download failed
+        """
+        avatar_url = summaries["response"]["players"][0]["avatar"]
+        return await self.load_image(
+            avatar_url, cache_key=parsing.get_avatar_key(avatar_url)
+        )
+
+    async def fetch_icons(self, games: GameTable) -> list:
+        """Fetch and decode the icons of all games concurrently.
+
+        Args:
+            games (GameTable): the games to fetch icons for
+
+        Returns:
+            list: decoded icons in the order of the games, None for failed downloads
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def fetch_icon(record):
+            async with semaphore:
+                return await self.load_image(record.icon_url, cache_key=record.icon_key)
+
+        return await asyncio.gather(*(fetch_icon(record) for record in games))
+
+    async def load_image(self, image_url: str, cache_key: str = None) -> Image.Image:
+        """Download and decode an image.
+
+        Args:
+            image_url (str): url of the image
+            cache_key (str): content hash of the image used by the media cache
+
+        Returns:
+            Image.Image: decoded image, or None if the download failed
+        """
+        data = None
+        if self.media_cache is not None and cache_key:
+            data = await asyncio.to_thread(self.media_cache.get, cache_key)
+        try:
+            if data is None:
+                data = await self.fetch(image_url)
+                if self.media_cache is not None and cache_key:
+                    await asyncio.to_thread(self.media_cache.put, cache_key, data)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print("Error fetching image:", e)
+            # Return a placeholder to handle the error accordingly
+            return None
+        try:
+            return await asyncio.to_thread(self.decode_image, data)
+        except OSError as e:
+            # Not an image, e.g. an error page or a corrupt cache entry
+            print("Error decoding image:", e)
+            if self.media_cache is not None and cache_key:
+                await asyncio.to_thread(self.media_cache.delete, cache_key)
+            return None
+
+    @staticmethod
+    def decode_image(data: bytes) -> Image.Image:
+        """Decode image data.
+
+        Args:
+            data (bytes): encoded image
+
+        Returns:
+            Image.Image: decoded image
+        """
+        image = Image.open(io.BytesIO(data))
+        image.load()
+        return image
+
+    def fetch_username(self, summaries: dict) -> str:
+        """Filter and return the username.
+
+        Args:
+            summaries (dict): data containing the fetched information about user
+
+        Returns:
+            str: username
+        """
+        return parsing.parse_username(summaries)
+
+    def fetch_user_status(self, summaries: dict) -> str:
+        """Filter, process and return user status.
+
+        Args:
+            summaries (dict): data containing the fetched information about user
+
+        Returns:
+            str: status of user
+        """
+        return parsing.parse_user_status(summaries)
+
+    def fetch_last_logoff(self, summaries: dict) -> str:
+        """Filter, process and return the time the user last logged off.
+
+        Args:
+            summaries (dict): data containing the fetched information about user
+
+        Returns:
+            str: the time the user last logged off
+        """
+        return parsing.parse_last_logoff(summaries)
+
+    def fetch_games(self, games: dict) -> GameTable:
+        """Filter and return the games of a response as a GameTable.
+
+        Args:
+            games (dict): data containing the fetched information about games
+
+        Returns:
+            GameTable: the games of the response
+        """
+        return GameTable.from_response(games)
@@ -2,62 +2,192 @@
 
 import json
 import os
+import sqlite3
+import threading
+import time
+
+from steam_web_api_client.core.metrics import DEFAULT_METRICS, Metrics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profiles (
+    steam_id TEXT PRIMARY KEY,
+    username TEXT NOT NULL DEFAULT '',
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_username ON profiles (username);
+"""
 
 
 class DataHandler:
-    """Read and write to json file.
+    # pylint: disable=too-many-instance-attributes
+    """Read and write to a SQLite database.
+
+    Profiles are looked up by indexed steam_id and username and saved with
+    incremental upserts, each write in its own transaction. An existing
+    data.json is imported once and renamed to data.json.migrated.
 
     Attributes:
-        data_path: A string containing the path of a json file
+        data_path: A string containing the path of the legacy json file
+        db_path: A string containing the path of the SQLite database
         api_key: A string holding the value of the steam api key
-        steam_id: A string holding the value of the steam_id of an user
-        input_data: A dictionary declaring the structure of the json file
+        id_list: A list holding the saved steam IDs
+        username_list: A list holding the usernames of the saved steam IDs
+        metrics: A Metrics recording the duration and errors of database access
     """
 
-    def __init__(self, data_path: str, api_key: str = ""):
+    def __init__(self, data_path: str, api_key: str = "", metrics: Metrics = None):
         self.data_path = data_path
+        self.db_path = os.path.splitext(data_path)[0] + ".db"
         self.api_key = api_key
         self.username_list = []
         self.id_list = []
-        self.user_data = []
+        self._positions = {}
+        self.metrics = metrics or DEFAULT_METRICS
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection to the database, created with its schema on first use."""
+        if self._connection is None:
+            directory = os.path.dirname(self.db_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._connection.executescript(SCHEMA)
+            self.migrate_json()
+        return self._connection
+
+    def migrate_json(self) -> None:
+        """Import api_key and user_data of data.json into the database.
+
+        Entries without a steam ID are skipped, so a damaged file is still
+        migrated instead of failing every time the database is opened.
+        """
+        try:
+            with open(file=self.data_path, mode="r", encoding="utf-8") as json_file:
+                loaded_data = json.load(json_file)
+            api_key = loaded_data["api_key"]
+            user_data = loaded_data["user_data"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            return
+        if not isinstance(user_data, list):
+            user_data = []
+        now = time.time()
+        profiles = [
+            (str(entry["steam_id"]), str(entry.get("username") or ""), now)
+            for entry in user_data
+            if isinstance(entry, dict) and entry.get("steam_id")
+        ]
+        if len(profiles) < len(user_data):
+            print(
+                f"[WARNING] Skipped {len(user_data) - len(profiles)} invalid entries "
+                f"of {self.data_path}"
+            )
+        with self._connection:
+            if isinstance(api_key, str) and api_key:
+                self._connection.execute(
+                    "INSERT OR IGNORE INTO settings (name, value) VALUES ('api_key', ?)",
+                    (api_key,),
+                )
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO profiles (steam_id, username, updated_at) "
+                "VALUES (?, ?, ?)",
+                profiles,
+            )
+        os.replace(self.data_path, f"{self.data_path}.migrated")
+        print(f"[INFO] Migrated {self.data_path} to {self.db_path}")
 
     def read_data(self) -> str:
-        """Reads api_key and steam_id from data.json.
+        """Reads api_key and saved profiles from the database.
 
         Returns:
             str: value of api_key
         """
         try:
-            with open(file=self.data_path, mode="r", encoding="utf-8") as json_file:
-                loaded_data = json.load(json_file)
-                self.api_key = loaded_data["api_key"]
-                self.user_data = loaded_data["user_data"]
-                self.id_list = [entry["steam_id"] for entry in self.user_data]
-                self.username_list = [entry["username"] for entry in self.user_data]
-            print(f"[INFO] Loaded data from {self.data_path}")
-        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            with self.metrics.timer("data_handler", operation="read_data"), self._lock:
+                row = self.connection.execute(
+                    "SELECT value FROM settings WHERE name = 'api_key'"
+                ).fetchone()
+                profiles = self.connection.execute(
+                    "SELECT steam_id, username FROM profiles ORDER BY rowid"
+                ).fetchall()
+            self.api_key = row[0] if row else ""
+            self.id_list = [steam_id for steam_id, _ in profiles]
+            self.username_list = [username for _, username in profiles]
+            self._positions = {
+                steam_id: position for position, steam_id in enumerate(self.id_list)
+            }
+            print(f"[INFO] Loaded data from {self.db_path}")
+        except sqlite3.DatabaseError as e:
             self.api_key = ""
-            print(f"[INFO] Couldn't read data from {self.data_path}")
-            directory = os.path.dirname(self.data_path)
-            if not os.path.exists(directory):
-                os.makedirs(directory)
-            with open(file=self.data_path, mode="w", encoding="utf-8"):
-                print(f"Created {self.data_path}")
+            print(f"[INFO] Couldn't read data from {self.db_path}: {e}")
         return self.api_key
 
     def save_data(self) -> None:
-        """Writes api_key and steam_id to data.json."""
-        user_data_list = [
-            {"steam_id": steam_id, "username": username}
-            for steam_id, username in zip(self.id_list, self.username_list)
-        ]
-        input_data = {
-            "api_key": self.api_key,
-            "user_data": user_data_list,
-        }
-        with open(file=self.data_path, mode="w", encoding="utf-8") as json_file:
-            json.dump(input_data, json_file)
-            print(f"[INFO] Saved data to {self.data_path}")
+        """Writes api_key and all profiles in id_list to the database."""
+        with self.metrics.timer(
+            "data_handler", operation="save_data"
+        ), self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO settings (name, value) VALUES ('api_key', ?)",
+                (self.api_key,),
+            )
+            self.connection.executemany(
+                "INSERT INTO profiles (steam_id, username, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (steam_id) DO UPDATE SET username = excluded.username, "
+                "updated_at = excluded.updated_at",
+                [
+                    (steam_id, username, time.time())
+                    for steam_id, username in zip(self.id_list, self.username_list)
+                ],
+            )
+        print(f"[INFO] Saved data to {self.db_path}")
+
+    def save_api_key(self, api_key: str) -> None:
+        """Writes the api_key to the database if it changed.
+
+        Args:
+            api_key (str): value of the steam api key
+        """
+        if api_key == self.api_key:
+            return
+        self.api_key = api_key
+        with self.metrics.timer(
+            "data_handler", operation="save_api_key"
+        ), self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO settings (name, value) VALUES ('api_key', ?)",
+                (api_key,),
+            )
+
+    def save_profile(self, steam_id: str, username: str) -> None:
+        """Insert or update a single profile.
+
+        Args:
+            steam_id (str): steam ID of the user
+            username (str): current username of the user
+        """
+        with self.metrics.timer(
+            "data_handler", operation="save_profile"
+        ), self._lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO profiles (steam_id, username, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (steam_id) DO UPDATE SET username = excluded.username, "
+                "updated_at = excluded.updated_at",
+                (steam_id, username, time.time()),
+            )
+        position = self._positions.get(steam_id)
+        if position is not None:
+            self.username_list[position] = username
+        else:
+            self._positions[steam_id] = len(self.id_list)
+            self.id_list.append(steam_id)
+            self.username_list.append(username)
 
     def get_username_by_id(self, steam_id: str) -> str:
         """Get the username associated with the given steam_id.
@@ -68,7 +198,36 @@ class DataHandler:
         Returns:
             str: The corresponding username, or an empty string if not found.
         """
-        for entry in self.user_data:
-            if entry["steam_id"] == steam_id:
-                return entry["username"]
-        return ""
+        with self.metrics.timer(
+            "data_handler", operation="get_username_by_id"
+        ), self._lock:
+            row = self.connection.execute(
+                "SELECT username FROM profiles WHERE steam_id = ?", (steam_id,)
+            ).fetchone()
+        return row[0] if row else ""
+
+    def get_id_by_username(self, username: str) -> str:
+        """Get the steam_id associated with the given username.
+
+        Args:
+            username (str): The username to look up.
+
+        Returns:
+            str: The most recently saved steam_id, or an empty string if not found.
+        """
+        with self.metrics.timer(
+            "data_handler", operation="get_id_by_username"
+        ), self._lock:
+            row = self.connection.execute(
+                "SELECT steam_id FROM profiles WHERE username = ? "
+                "ORDER BY updated_at DESC LIMIT 1",
+                (username,),
+            ).fetchone()
+        return row[0] if row else ""
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
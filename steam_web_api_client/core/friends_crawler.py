@@ -0,0 +1,235 @@
+"""Crawl the friend network of users breadth-first into a SQLite database."""
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+from steam_web_api_client.core import parsing
+
+FIELDS = (
+    "steam_id",
+    "depth",
+    "username",
+    "status",
+    "last_logoff",
+    "avatar_url",
+    "friend_count",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    steam_id INTEGER PRIMARY KEY,
+    depth INTEGER NOT NULL,
+    expanded INTEGER NOT NULL DEFAULT 0,
+    summarized INTEGER NOT NULL DEFAULT 0,
+    friend_count INTEGER,
+    username TEXT,
+    status TEXT,
+    last_logoff TEXT,
+    avatar_url TEXT
+);
+CREATE INDEX IF NOT EXISTS nodes_frontier ON nodes (expanded, depth);
+CREATE INDEX IF NOT EXISTS nodes_pending ON nodes (summarized, expanded);
+CREATE TABLE IF NOT EXISTS edges (
+    steam_id INTEGER NOT NULL,
+    friend_id INTEGER NOT NULL,
+    PRIMARY KEY (steam_id, friend_id)
+) WITHOUT ROWID;
+CREATE TEMP TABLE IF NOT EXISTS failed (steam_id INTEGER PRIMARY KEY);
+"""
+
+
+class FriendsCrawler:
+    """Expand friend lists level by level up to a maximum depth.
+
+    Every visited steam ID is a row of the nodes table, so each user is
+    expanded once and the frontier lives on disk instead of in memory. Only
+    one chunk of friend lists and summaries is held at a time. Friend lists
+    and summaries are stored in the same transaction that marks a node as
+    expanded or summarized, and the records are read back from the database
+    once the crawl is complete. An interrupted crawl continues where it
+    stopped when crawl() is called again with the same database and yields
+    every user once, including the ones of earlier runs. Users whose friend list
+    or summary couldn't be fetched are skipped for the rest of the crawl and
+    stay pending, so the next crawl() tries them again.
+
+    Attributes:
+        steam_api: A SteamAPI used for the API calls
+        db_path: A string containing the path of the SQLite database
+        max_depth: An integer holding the distance of the last expanded level
+        max_workers: An integer limiting the amount of concurrent API calls
+        chunk_size: An integer holding the amount of nodes handled at once
+    """
+
+    def __init__(
+        self,
+        steam_api,
+        db_path: str,
+        max_depth: int = 1,
+        max_workers: int = 4,
+        chunk_size: int = 4 * parsing.SUMMARIES_BATCH_SIZE,
+    ):
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.steam_api = steam_api
+        self.db_path = db_path
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._connection = sqlite3.connect(db_path)
+        self._connection.executescript(SCHEMA)
+
+    def crawl(self, seeds: Iterator) -> Iterator:
+        """Crawl the friends of the seeds and yield every visited user.
+
+        The records are yielded after the crawl is complete.
+
+        Args:
+            seeds (Iterator): steam IDs to start from, at depth 0
+
+        Yields:
+            dict: record with the keys of FIELDS
+        """
+        with self._connection:
+            self._connection.execute("DELETE FROM failed")
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO nodes (steam_id, depth) VALUES (?, 0)",
+                ((int(steam_id),) for steam_id in seeds),
+            )
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                self._summarize()
+                if not self._expand(executor):
+                    break
+            self._summarize()
+        (failed,) = self._connection.execute("SELECT COUNT(*) FROM failed").fetchone()
+        if failed:
+            print(f"[WARNING] Skipped {failed} users after failed API calls")
+        yield from self.iter_records()
+
+    def _expand(self, executor: ThreadPoolExecutor) -> int:
+        """Fetch the friend lists of a chunk of the lowest unexpanded level.
+
+        Args:
+            executor (ThreadPoolExecutor): runs the API calls
+
+        Returns:
+            int: amount of handled nodes, 0 when the crawl is complete
+        """
+        (depth,) = self._connection.execute(
+            "SELECT MIN(depth) FROM nodes WHERE expanded = 0 "
+            "AND steam_id NOT IN failed"
+        ).fetchone()
+        if depth is None or depth >= self.max_depth:
+            return 0
+        steam_ids = [
+            steam_id
+            for (steam_id,) in self._connection.execute(
+                "SELECT steam_id FROM nodes WHERE expanded = 0 AND depth = ? "
+                "AND steam_id NOT IN failed LIMIT ?",
+                (depth, self.chunk_size),
+            )
+        ]
+        friend_lists = executor.map(
+            lambda steam_id: self.steam_api.get_friend_list(steamid=str(steam_id)),
+            steam_ids,
+        )
+        expanded = 0
+        with self._connection:
+            for steam_id, friends in zip(steam_ids, friend_lists):
+                if friends is None:
+                    self._connection.execute(
+                        "INSERT INTO failed (steam_id) VALUES (?)", (steam_id,)
+                    )
+                    continue
+                # Private friend lists are expanded without a friend count
+                friend_ids = parsing.parse_friend_ids(friends) if friends else None
+                for friend_id in friend_ids or ():
+                    self._connection.execute(
+                        "INSERT OR IGNORE INTO edges (steam_id, friend_id) "
+                        "VALUES (?, ?)",
+                        (steam_id, int(friend_id)),
+                    )
+                    self._connection.execute(
+                        "INSERT OR IGNORE INTO nodes (steam_id, depth) VALUES (?, ?)",
+                        (int(friend_id), depth + 1),
+                    )
+                self._connection.execute(
+                    "UPDATE nodes SET expanded = 1, friend_count = ? "
+                    "WHERE steam_id = ?",
+                    (None if friend_ids is None else len(friend_ids), steam_id),
+                )
+                expanded += 1
+        print(f"[INFO] Expanded {expanded} users at depth {depth}")
+        return len(steam_ids)
+
+    def _summarize(self) -> None:
+        """Fetch and store the summaries of all nodes which won't be expanded any more.
+
+        Summaries are fetched chunk by chunk, 100 steam IDs per request.
+        Nodes without a summary are left pending.
+        """
+        while True:
+            steam_ids = [
+                steam_id
+                for (steam_id,) in self._connection.execute(
+                    "SELECT steam_id FROM nodes "
+                    "WHERE summarized = 0 AND (expanded = 1 OR depth >= ?) "
+                    "AND steam_id NOT IN failed LIMIT ?",
+                    (self.max_depth, self.chunk_size),
+                )
+            ]
+            if not steam_ids:
+                return
+            profiles = self.steam_api.get_player_summaries_bulk(
+                [str(steam_id) for steam_id in steam_ids]
+            )
+            with self._connection:
+                for steam_id in steam_ids:
+                    profile = profiles.get(str(steam_id))
+                    if profile is None:
+                        self._connection.execute(
+                            "INSERT INTO failed (steam_id) VALUES (?)", (steam_id,)
+                        )
+                        continue
+                    self._connection.execute(
+                        "UPDATE nodes SET summarized = 1, username = ?, status = ?, "
+                        "last_logoff = ?, avatar_url = ? WHERE steam_id = ?",
+                        (
+                            profile["username"],
+                            profile["status"],
+                            profile["last_logoff"],
+                            profile["avatar_url"],
+                            steam_id,
+                        ),
+                    )
+
+    def iter_records(self) -> Iterator:
+        """Yield the stored records of all summarized users.
+
+        Yields:
+            dict: record with the keys of FIELDS, ordered by depth
+        """
+        cursor = self._connection.execute(
+            f"SELECT {', '.join(FIELDS)} FROM nodes WHERE summarized = 1 "
+            "ORDER BY depth, steam_id"
+        )
+        while rows := cursor.fetchmany(1000):
+            for row in rows:
+                record = dict(zip(FIELDS, row))
+                record["steam_id"] = str(record["steam_id"])
+                yield record
+
+    def iter_edges(self) -> Iterator:
+        """Yield the friendships found so far.
+
+        Yields:
+            tuple: steam IDs of the user and of the friend
+        """
+        cursor = self._connection.execute("SELECT steam_id, friend_id FROM edges")
+        while rows := cursor.fetchmany(1000):
+            for steam_id, friend_id in rows:
+                yield str(steam_id), str(friend_id)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
@@ -0,0 +1,179 @@
+"""Compact table of games returned from Steam Web API."""
+
+from steam_web_api_client.core import parsing
+
+
+class GameRecord:
+    """Information about one game with playtimes stored as raw minutes.
+
+    Attributes:
+        appid: An integer holding the app ID of the game
+        name: A string holding the title of the game
+        icon_hash: A string holding the hash of the game icon
+        playtime_2weeks: An integer holding the played minutes in the last 2 weeks
+        playtime_forever: An integer holding the overall played minutes
+    """
+
+    __slots__ = ("appid", "name", "icon_hash", "playtime_2weeks", "playtime_forever")
+
+    def __init__(
+        self,
+        appid: int,
+        name: str,
+        icon_hash: str,
+        playtime_2weeks: int,
+        playtime_forever: int,
+    ):
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.appid = appid
+        self.name = name
+        self.icon_hash = icon_hash
+        self.playtime_2weeks = playtime_2weeks
+        self.playtime_forever = playtime_forever
+
+    def __repr__(self) -> str:
+        return f"GameRecord(appid={self.appid}, name={self.name!r})"
+
+    @property
+    def playtime_2weeks_text(self) -> str:
+        """Formatted playtime in the last 2 weeks."""
+        return parsing.format_playtime(self.playtime_2weeks)
+
+    @property
+    def playtime_forever_text(self) -> str:
+        """Formatted overall playtime."""
+        return parsing.format_playtime(self.playtime_forever)
+
+    @property
+    def icon_url(self) -> str:
+        """Url of the game icon."""
+        return parsing.get_icon_url(self.appid, self.icon_hash)
+
+    @property
+    def icon_key(self) -> str:
+        """Media cache key of the game icon."""
+        return parsing.get_icon_key(self.appid, self.icon_hash)
+
+
+class GameTable:
+    """Ordered collection of GameRecords with aggregated playtimes.
+
+    Attributes:
+        records: A list holding the GameRecords in the order of the response
+        total_playtime_2weeks: An integer summing the minutes of the last 2 weeks
+        total_playtime_forever: An integer summing the overall minutes
+    """
+
+    def __init__(self, records: list = None):
+        self.records = list(records or [])
+        self.total_playtime_2weeks = sum(
+            record.playtime_2weeks for record in self.records
+        )
+        self.total_playtime_forever = sum(
+            record.playtime_forever for record in self.records
+        )
+
+    @classmethod
+    def from_response(cls, games: dict) -> "GameTable":
+        """Build a table in a single pass over a response.
+
+        Args:
+            games (dict): data containing the fetched information about games
+
+        Returns:
+            GameTable: the games of the response
+        """
+        table = cls()
+        for game in games["response"].get("games", []):
+            table.append(
+                GameRecord(
+                    appid=game["appid"],
+                    name=game.get("name", ""),
+                    icon_hash=game.get("img_icon_url", ""),
+                    playtime_2weeks=game.get("playtime_2weeks", 0),
+                    playtime_forever=game.get("playtime_forever", 0),
+                )
+            )
+        return table
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, index: int) -> GameRecord:
+        return self.records[index]
+
+    def append(self, record: GameRecord) -> None:
+        """Add a record and update the totals.
+
+        Args:
+            record (GameRecord): the game to add
+        """
+        self.records.append(record)
+        self.total_playtime_2weeks += record.playtime_2weeks
+        self.total_playtime_forever += record.playtime_forever
+
+    def diff(self, newer: "GameTable") -> tuple:
+        """Compare the table with a newer response, matching games by app ID.
+
+        Args:
+            newer (GameTable): the games of the newer response
+
+        Returns:
+            tuple: list of (index, record) whose values changed, list of added
+            records and list of indexes of removed records, all in ascending order
+        """
+        newer_records = {record.appid: record for record in newer}
+        changed = []
+        removed = []
+        for index, record in enumerate(self.records):
+            newer_record = newer_records.pop(record.appid, None)
+            if newer_record is None:
+                removed.append(index)
+            elif any(
+                getattr(record, field) != getattr(newer_record, field)
+                for field in GameRecord.__slots__
+            ):
+                changed.append((index, newer_record))
+        return changed, list(newer_records.values()), removed
+
+    def patch(self, changed: list, added: list, removed: list) -> "GameTable":
+        """Return a copy of the table with the changes of diff applied.
+
+        Changed records keep their position, removed records are dropped and
+        added records are appended, the same way the game list is updated.
+
+        Args:
+            changed (list): (index, record) tuples of changed records
+            added (list): records to append
+            removed (list): indexes of records to drop in ascending order
+
+        Returns:
+            GameTable: the patched table
+        """
+        records = list(self.records)
+        for index, record in changed:
+            records[index] = record
+        for index in reversed(removed):
+            del records[index]
+        return GameTable(records + list(added))
+
+    def sorted_by(self, field: str, reverse: bool = True) -> "GameTable":
+        """Return a copy of the table sorted by a field.
+
+        Args:
+            field (str): name of a GameRecord attribute
+            reverse (bool): sort descending
+
+        Returns:
+            GameTable: the sorted table
+        """
+        return GameTable(
+            sorted(
+                self.records,
+                key=lambda record: getattr(record, field),
+                reverse=reverse,
+            )
+        )
@@ -0,0 +1,144 @@
+"""Decode and shrink images on worker threads for display in tkinter.
+
+Pillow and tkinter are only imported when an image is processed, so the
+pipeline can be created headless.
+"""
+
+import contextlib
+import io
+import threading
+import time
+
+ICON_SIZE = (32, 32)
+
+
+class Thumbnail:
+    # pylint: disable=too-few-public-methods
+    """Image ready to be shown, holding only the pixels of the display size.
+
+    Attributes:
+        width: An integer holding the width in pixels
+        height: An integer holding the height in pixels
+        data: Bytes holding the image as binary PPM, which tkinter reads natively
+    """
+
+    __slots__ = ("width", "height", "data")
+
+    def __init__(self, width: int, height: int, data: bytes):
+        self.width = width
+        self.height = height
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"Thumbnail({self.width}x{self.height})"
+
+
+class StageTimings:
+    """Count and sum up the time spent in each stage of the pipeline.
+
+    Attributes:
+        counts: A dictionary holding the amount of runs per stage
+        totals: A dictionary holding the summed up seconds per stage
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.totals = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def measure(self, stage: str):
+        """Add the duration of the with block to a stage.
+
+        Args:
+            stage (str): name of the stage
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.counts[stage] = self.counts.get(stage, 0) + 1
+                self.totals[stage] = self.totals.get(stage, 0.0) + elapsed
+
+    def as_dict(self) -> dict:
+        """Return the timings of all stages.
+
+        Returns:
+            dict: count, total and mean milliseconds per stage
+        """
+        with self._lock:
+            return {
+                stage: {
+                    "count": count,
+                    "total_ms": self.totals[stage] * 1000,
+                    "mean_ms": self.totals[stage] * 1000 / count,
+                }
+                for stage, count in self.counts.items()
+            }
+
+    def __str__(self) -> str:
+        return ", ".join(
+            f"{stage} {timing['count']}x {timing['mean_ms']:.2f}ms"
+            for stage, timing in self.as_dict().items()
+        )
+
+
+class ImagePipeline:
+    """Turn downloaded image data into small buffers for tkinter.
+
+    process() decodes and resizes on the calling worker thread, JPEGs are
+    already scaled down while decoding. Only to_photo_image() has to run on
+    the Tk thread and no Pillow image is kept alive afterwards.
+
+    Attributes:
+        size: A tuple holding the default display size in pixels
+        timings: A StageTimings measuring decode, resize, encode and photo
+    """
+
+    def __init__(self, size: tuple = ICON_SIZE):
+        self.size = size
+        self.timings = StageTimings()
+
+    def process(self, data: bytes, size: tuple = None) -> Thumbnail:
+        """Decode an image and shrink it to fit the display size.
+
+        Args:
+            data (bytes): encoded image
+            size (tuple): maximum width and height, defaults to size
+
+        Returns:
+            Thumbnail: the shrunk image
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from PIL import Image
+
+        size = size or self.size
+        with self.timings.measure("decode"):
+            image = Image.open(io.BytesIO(data))
+            image.draft("RGB", size)
+            image = image.convert("RGB")
+        with self.timings.measure("resize"):
+            if image.width > size[0] or image.height > size[1]:
+                image.thumbnail(size, Image.Resampling.LANCZOS)
+        with self.timings.measure("encode"):
+            header = f"P6 {image.width} {image.height} 255\n".encode("ascii")
+            return Thumbnail(image.width, image.height, header + image.tobytes())
+
+    def to_photo_image(self, thumbnail: Thumbnail):
+        """Create a tkinter image, has to be called on the Tk thread.
+
+        Args:
+            thumbnail (Thumbnail): processed image, or None
+
+        Returns:
+            tk.PhotoImage: the tkinter image, or None
+        """
+        if thumbnail is None:
+            return None
+        # pylint: disable-next=import-outside-toplevel
+        import tkinter as tk
+
+        with self.timings.measure("photo"):
+            return tk.PhotoImage(data=thumbnail.data, format="PPM")
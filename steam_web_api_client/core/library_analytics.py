@@ -0,0 +1,162 @@
+"""Analyse whole game libraries with vectorized NumPy operations."""
+
+import numpy as np
+
+# Upper bounds of the playtime distribution in hours
+HOUR_BINS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, np.inf)
+
+
+class Library:
+    """Columns of the games owned by an user.
+
+    The response is read once into an integer matrix, every aggregate is
+    computed on its columns without touching the dictionaries again.
+
+    Attributes:
+        appids: An array holding the app IDs of the games
+        playtime_forever: An array holding the overall played minutes
+        playtime_2weeks: An array holding the played minutes in the last 2 weeks
+        rtime_last_played: An array holding the unix time of the last session
+        names: A list holding the titles, empty strings without appinfo
+    """
+
+    def __init__(
+        self,
+        appids: np.ndarray,
+        playtime_forever: np.ndarray,
+        playtime_2weeks: np.ndarray,
+        rtime_last_played: np.ndarray,
+        names: list = None,
+    ):
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.appids = appids
+        self.playtime_forever = playtime_forever
+        self.playtime_2weeks = playtime_2weeks
+        self.rtime_last_played = rtime_last_played
+        self.names = names if names is not None else [""] * len(appids)
+
+    @classmethod
+    def from_response(cls, owned_games: dict) -> "Library":
+        """Build the columns in a single pass over a response.
+
+        Args:
+            owned_games (dict): data containing the fetched owned games
+
+        Returns:
+            Library: the games of the response
+        """
+        games = owned_games["response"].get("games", [])
+        matrix = np.array(
+            [
+                (
+                    game["appid"],
+                    game.get("playtime_forever", 0),
+                    game.get("playtime_2weeks", 0),
+                    game.get("rtime_last_played", 0),
+                )
+                for game in games
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 4)
+        return cls(
+            appids=matrix[:, 0],
+            playtime_forever=matrix[:, 1],
+            playtime_2weeks=matrix[:, 2],
+            rtime_last_played=matrix[:, 3],
+            names=[game.get("name", "") for game in games],
+        )
+
+    def __len__(self) -> int:
+        return len(self.appids)
+
+    @property
+    def total_playtime_forever(self) -> int:
+        """Overall played minutes of all games."""
+        return int(self.playtime_forever.sum())
+
+    @property
+    def total_playtime_2weeks(self) -> int:
+        """Played minutes of all games in the last 2 weeks."""
+        return int(self.playtime_2weeks.sum())
+
+    @property
+    def never_played(self) -> int:
+        """Amount of games without any playtime."""
+        return int(np.count_nonzero(self.playtime_forever == 0))
+
+    def played_since(self, timestamp: int) -> int:
+        """Count the games played since a point in time.
+
+        Args:
+            timestamp (int): unix time
+
+        Returns:
+            int: amount of games last played at or after timestamp
+        """
+        return int(np.count_nonzero(self.rtime_last_played >= timestamp))
+
+    def percentiles(self, shares: tuple = (50, 75, 90, 99)) -> dict:
+        """Return percentiles of the playtime of the played games.
+
+        Args:
+            shares (tuple): percentiles between 0 and 100
+
+        Returns:
+            dict: playtime in minutes per percentile, 0 without played games
+        """
+        played = self.playtime_forever[self.playtime_forever > 0]
+        if not played.size:
+            return dict.fromkeys(shares, 0.0)
+        return dict(zip(shares, np.percentile(played, shares).tolist()))
+
+    def top(self, count: int = 10, by: str = "playtime_forever") -> list:
+        """Return the most played games.
+
+        Only the count largest values are sorted, not the whole library.
+
+        Args:
+            count (int): amount of games
+            by (str): "playtime_forever" or "playtime_2weeks"
+
+        Returns:
+            list: app ID, name and minutes per game, most played first
+        """
+        values = getattr(self, by)
+        count = min(count, len(values))
+        if not count:
+            return []
+        indexes = np.argpartition(values, -count)[-count:]
+        indexes = indexes[np.argsort(values[indexes])[::-1]]
+        return [
+            (int(self.appids[index]), self.names[index], int(values[index]))
+            for index in indexes
+        ]
+
+    def distribution(self, bins: tuple = HOUR_BINS) -> list:
+        """Count the played games per playtime range.
+
+        Args:
+            bins (tuple): ascending upper bounds of the ranges in hours
+
+        Returns:
+            list: (upper bound in hours, amount of games) tuples
+        """
+        hours = self.playtime_forever[self.playtime_forever > 0] / 60
+        counts, _ = np.histogram(hours, bins=(0,) + tuple(bins))
+        return list(zip(bins, counts.tolist()))
+
+    def summary(self) -> dict:
+        """Return the main figures of the library.
+
+        Returns:
+            dict: counts and playtimes in minutes
+        """
+        percentiles = self.percentiles((50, 90))
+        return {
+            "game_count": len(self),
+            "never_played": self.never_played,
+            "playtime_2weeks": self.total_playtime_2weeks,
+            "playtime_forever": self.total_playtime_forever,
+            "playtime_median": percentiles[50],
+            "playtime_p90": percentiles[90],
+        }
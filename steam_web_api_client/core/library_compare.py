@@ -0,0 +1,206 @@
+"""Compare the game libraries of many users on a shared app index."""
+
+import numpy as np
+
+# Apps unpacked at once when counting the pairwise intersections
+BLOCK_SIZE = 8192
+
+
+class LibraryComparison:
+    # pylint: disable=too-many-instance-attributes
+    """Sets of owned apps of many users as bitsets over one sorted app index.
+
+    Every user is a row of packed bits, one bit per app of the index, so 200
+    users owning 20,000 distinct apps take 500 KB. Playtimes are kept once
+    per owned app, grouped by app, for the rankings. Built from a dictionary
+    holding a Library per steam ID.
+
+    Attributes:
+        steam_ids: A list holding the steam IDs in the order of the rows
+        appids: An array holding the sorted app IDs of the shared index
+        owned: An array holding the packed ownership bits, one row per user
+        sizes: An array holding the amount of owned apps per user
+        owners: An array holding the amount of owners per app
+        total_playtime: An array holding the summed up minutes per app
+    """
+
+    def __init__(self, libraries: dict):
+        self.steam_ids = list(libraries)
+        columns = [library.appids for library in libraries.values()]
+        self.appids = np.unique(np.concatenate(columns)) if columns else np.array([])
+        users = np.repeat(
+            np.arange(len(columns), dtype=np.int32), [len(appids) for appids in columns]
+        )
+        apps = np.searchsorted(self.appids, np.concatenate(columns or [[]]))
+        playtimes = np.concatenate(
+            [library.playtime_forever for library in libraries.values()] or [[]]
+        ).astype(np.int64)
+
+        # Set the bits in place, most significant bit first like np.packbits,
+        # without the unpacked matrix which takes 8 times the memory
+        self.owned = np.zeros((len(columns), (len(self.appids) + 7) // 8), np.uint8)
+        np.bitwise_or.at(
+            self.owned,
+            (users, apps >> 3),
+            np.right_shift(np.uint8(0x80), (apps & 7).astype(np.uint8)),
+        )
+        self.sizes = np.bincount(users, minlength=len(columns))
+        self.owners = np.bincount(apps, minlength=len(self.appids))
+        self.total_playtime = np.bincount(
+            apps, weights=playtimes, minlength=len(self.appids)
+        ).astype(np.int64)
+
+        # Owners and their playtimes grouped by app for the rankings
+        order = np.argsort(apps, kind="stable")
+        self._app_users = users[order]
+        self._app_playtimes = playtimes[order]
+        self._app_starts = np.searchsorted(apps[order], np.arange(len(self.appids) + 1))
+
+    def __len__(self) -> int:
+        return len(self.steam_ids)
+
+    def _rows(self, steam_ids: list = None) -> np.ndarray:
+        """Return the packed rows of some users.
+
+        Args:
+            steam_ids (list): steam IDs of the users, defaults to all users
+
+        Returns:
+            np.ndarray: the packed ownership bits of the users
+        """
+        if steam_ids is None:
+            return self.owned
+        return self.owned[[self.steam_ids.index(steam_id) for steam_id in steam_ids]]
+
+    def _to_appids(self, packed: np.ndarray) -> np.ndarray:
+        """Map one packed row onto the app IDs of its set bits.
+
+        Args:
+            packed (np.ndarray): packed bits of one row
+
+        Returns:
+            np.ndarray: sorted app IDs
+        """
+        bits = np.unpackbits(packed, count=len(self.appids)).astype(bool)
+        return self.appids[bits]
+
+    def common(self, steam_ids: list = None) -> np.ndarray:
+        """Return the apps owned by all of the users.
+
+        Args:
+            steam_ids (list): steam IDs of the users, defaults to all users
+
+        Returns:
+            np.ndarray: sorted app IDs
+        """
+        rows = self._rows(steam_ids)
+        if rows.size == 0:
+            return self.appids[:0]
+        return self._to_appids(np.bitwise_and.reduce(rows, axis=0))
+
+    def union(self, steam_ids: list = None) -> np.ndarray:
+        """Return the apps owned by any of the users.
+
+        Args:
+            steam_ids (list): steam IDs of the users, defaults to all users
+
+        Returns:
+            np.ndarray: sorted app IDs
+        """
+        rows = self._rows(steam_ids)
+        if rows.size == 0:
+            return self.appids[:0]
+        return self._to_appids(np.bitwise_or.reduce(rows, axis=0))
+
+    def intersection_sizes(self) -> np.ndarray:
+        """Count the shared apps of every pair of users.
+
+        The bitsets are unpacked block by block and multiplied, so the
+        memory needed doesn't grow with the size of the index.
+
+        Returns:
+            np.ndarray: symmetric matrix of shared apps per pair of users
+        """
+        counts = np.zeros((len(self), len(self)), dtype=np.float64)
+        for start in range(0, len(self.appids), BLOCK_SIZE):
+            block = np.unpackbits(
+                self.owned[:, start // 8 : (start + BLOCK_SIZE) // 8], axis=1
+            ).astype(np.float32)
+            counts += block @ block.T
+        return counts.astype(np.int64)
+
+    def jaccard(self) -> np.ndarray:
+        """Return the Jaccard similarity of every pair of users.
+
+        Returns:
+            np.ndarray: symmetric matrix of shared apps divided by all apps
+        """
+        intersections = self.intersection_sizes()
+        unions = self.sizes[:, None] + self.sizes[None, :] - intersections
+        return np.divide(
+            intersections,
+            unions,
+            out=np.zeros(intersections.shape),
+            where=unions > 0,
+        )
+
+    def similar(self, steam_id: str, count: int = 10) -> list:
+        """Return the users whose libraries are most similar to one user.
+
+        Args:
+            steam_id (str): steam ID of the user
+            count (int): amount of users
+
+        Returns:
+            list: steam ID and Jaccard similarity per user, most similar first
+        """
+        row = self.steam_ids.index(steam_id)
+        similarities = self.jaccard()[row]
+        similarities[row] = -1
+        order = np.argsort(similarities)[::-1][: min(count, len(self) - 1)]
+        return [(self.steam_ids[index], float(similarities[index])) for index in order]
+
+    def most_common(self, count: int = 10) -> list:
+        """Return the apps owned by the most users.
+
+        Ties are ordered by the summed up playtime.
+
+        Args:
+            count (int): amount of apps
+
+        Returns:
+            list: app ID, amount of owners and minutes played by all per app
+        """
+        order = np.lexsort((-self.total_playtime, -self.owners))[:count]
+        return [
+            (
+                int(self.appids[index]),
+                int(self.owners[index]),
+                int(self.total_playtime[index]),
+            )
+            for index in order
+        ]
+
+    def ranking(self, appid: int, count: int = 10) -> list:
+        """Return the users who played an app most.
+
+        Args:
+            appid (int): app ID of the game
+            count (int): amount of users
+
+        Returns:
+            list: steam ID and played minutes per owner, most played first
+        """
+        index = np.searchsorted(self.appids, appid)
+        if index == len(self.appids) or self.appids[index] != appid:
+            return []
+        start, end = self._app_starts[index], self._app_starts[index + 1]
+        playtimes = self._app_playtimes[start:end]
+        order = np.argsort(playtimes, kind="stable")[::-1][:count]
+        return [
+            (
+                self.steam_ids[self._app_users[start + position]],
+                int(playtimes[position]),
+            )
+            for position in order
+        ]
@@ -0,0 +1,134 @@
+"""Persistent on-disk cache for downloaded images."""
+
+import os
+import threading
+from collections import OrderedDict
+
+SUFFIX = ".jpg"
+
+
+class MediaCache:
+    """Store image data on disk, keyed by the hash Steam uses in the url.
+
+    The size of every entry is kept in memory in least recently used order,
+    read once from the directory, so evicting doesn't scan the directory.
+
+    Attributes:
+        cache_dir: A string containing the path of the cache directory
+        max_size: An integer limiting the total size of the cache in bytes
+        size: An integer holding the current total size of the cache in bytes
+        hits: An integer counting the reads served from the cache
+        misses: An integer counting the reads of missing entries
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = 50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        # Files left by interrupted writes end with .tmp and are not entries
+        with os.scandir(self.cache_dir) as entries:
+            files = sorted(
+                (
+                    entry.stat().st_mtime,
+                    entry.name[: -len(SUFFIX)],
+                    entry.stat().st_size,
+                )
+                for entry in entries
+                if entry.is_file() and entry.name.endswith(SUFFIX)
+            )
+        self._entries = OrderedDict((key, size) for _, key, size in files)
+        self.size = sum(self._entries.values())
+
+    def get(self, key: str) -> bytes:
+        """Read the data stored under key and mark it as recently used.
+
+        Args:
+            key (str): content hash identifying the data
+
+        Returns:
+            bytes: the cached data, or None if it is not cached
+        """
+        path = self._path(key)
+        try:
+            with open(file=path, mode="rb") as cache_file:
+                data = cache_file.read()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            else:
+                # Written by another process sharing the directory
+                self._entries[key] = len(data)
+                self.size += len(data)
+        self.hits += 1
+        return data
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of reads served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store data under key and evict the least recently used entries.
+
+        Args:
+            key (str): content hash identifying the data
+            data (bytes): the data to store
+        """
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                with open(file=temp_path, mode="wb") as cache_file:
+                    cache_file.write(data)
+                os.replace(temp_path, path)
+            except OSError as e:
+                print(f"[WARNING] Couldn't write {path}: {e}")
+                return
+            self.size += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            if self.size > self.max_size:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        """Remove the data stored under key, e.g. when it can't be decoded.
+
+        Args:
+            key (str): content hash identifying the data
+        """
+        path = self._path(key)
+        with self._lock:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.size -= self._entries.pop(key, 0)
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the size limit is met."""
+        while self.size > self.max_size and self._entries:
+            key, size = self._entries.popitem(last=False)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self.size -= size
+
+    def _path(self, key: str) -> str:
+        """Map a key onto a file in the cache directory.
+
+        Args:
+            key (str): content hash identifying the data
+
+        Returns:
+            str: path of the cache file
+        """
+        return os.path.join(self.cache_dir, f"{key}{SUFFIX}")
@@ -0,0 +1,258 @@
+"""Record latencies, sizes, errors and cache hit rates of the client."""
+
+import bisect
+import contextlib
+import json
+import threading
+import time
+from typing import Callable
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    """Count observations in cumulative buckets like Prometheus does.
+
+    Attributes:
+        buckets: A tuple holding the upper bounds of the buckets
+        counts: A list counting the observations per bucket, the last one is +Inf
+        sum: A float summing up all observations
+        count: An integer counting all observations
+    """
+
+    def __init__(self, buckets: tuple):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Add an observation.
+
+        Args:
+            value (float): the observed value
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list:
+        """Return the amount of observations less or equal to each bound.
+
+        Returns:
+            list: (bound, count) tuples, the last bound is "+Inf"
+        """
+        total = 0
+        counts = []
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            counts.append((bound, total))
+        return counts
+
+
+class Metrics:
+    """Collect counters, histograms and gauges and export them.
+
+    Every metric is identified by its name and labels. Listeners added with
+    add_listener() are called with (name, value, labels) for each recorded
+    value, e.g. to forward them to another telemetry system.
+
+    Attributes:
+        counters: A dictionary holding the counter values by name and labels
+        histograms: A dictionary holding the Histograms by name and labels
+        gauges: A dictionary holding functions returning the current gauge values
+        listeners: A list of callables receiving every recorded value
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: Callable) -> None:
+        """Forward every recorded value to a callable.
+
+        Args:
+            listener (Callable): called with name, value and labels dictionary
+        """
+        self.listeners.append(listener)
+
+    def increment(self, name: str, amount: float = 1, **labels) -> None:
+        """Increase a counter.
+
+        Args:
+            name (str): name of the counter
+            amount (float): value to add
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+        self._notify(name, amount, labels)
+
+    def observe(
+        self, name: str, value: float, buckets: tuple = LATENCY_BUCKETS, **labels
+    ) -> None:
+        """Add an observation to a histogram.
+
+        Args:
+            name (str): name of the histogram
+            value (float): the observed value
+            buckets (tuple): upper bounds used when the histogram is created
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram(buckets)
+            self.histograms[key].observe(value)
+        self._notify(name, value, labels)
+
+    def register_gauge(self, name: str, function: Callable, **labels) -> None:
+        """Add a gauge which is read when the metrics are exported.
+
+        Args:
+            name (str): name of the gauge
+            function (Callable): returns the current value
+        """
+        with self._lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = function
+
+    @contextlib.contextmanager
+    def timer(self, name: str, **labels):
+        """Measure the duration of the with block.
+
+        The duration is observed in the histogram name_seconds. Exceptions
+        are counted in name_errors_total by their type and raised again.
+
+        Args:
+            name (str): prefix of the metric names
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.increment(f"{name}_errors_total", kind=type(e).__name__, **labels)
+            raise
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter() - start, **labels)
+
+    def as_dict(self) -> dict:
+        """Return all metrics.
+
+        Returns:
+            dict: counters, histograms and gauges, each a list of dictionaries
+        """
+        with self._lock:
+            counters = list(self.counters.items())
+            histograms = [
+                (key, histogram.cumulative_counts(), histogram.sum, histogram.count)
+                for key, histogram in self.histograms.items()
+            ]
+            gauges = list(self.gauges.items())
+        return {
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in counters
+            ],
+            "histograms": [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "buckets": [[str(bound), count] for bound, count in buckets],
+                    "sum": total,
+                    "count": count,
+                }
+                for (name, labels), buckets, total, count in histograms
+            ],
+            "gauges": [
+                {"name": name, "labels": dict(labels), "value": function()}
+                for (name, labels), function in gauges
+            ],
+        }
+
+    def to_json(self) -> str:
+        """Export all metrics as JSON.
+
+        Returns:
+            str: the metrics of as_dict() as JSON
+        """
+        return json.dumps(self.as_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Export all metrics in the Prometheus text format.
+
+        Returns:
+            str: one line per sample
+        """
+        metrics = self.as_dict()
+        lines = []
+        for kind, entries in (
+            ("counter", metrics["counters"]),
+            ("gauge", metrics["gauges"]),
+        ):
+            for name in sorted({entry["name"] for entry in entries}):
+                lines.append(f"# TYPE {name} {kind}")
+                for entry in entries:
+                    if entry["name"] == name:
+                        labels = format_labels(entry["labels"])
+                        lines.append(f"{name}{labels} {entry['value']}")
+        histograms = metrics["histograms"]
+        for name in sorted({entry["name"] for entry in histograms}):
+            lines.append(f"# TYPE {name} histogram")
+            for entry in histograms:
+                if entry["name"] != name:
+                    continue
+                for bound, count in entry["buckets"]:
+                    labels = format_labels({**entry["labels"], "le": bound})
+                    lines.append(f"{name}_bucket{labels} {count}")
+                labels = format_labels(entry["labels"])
+                lines.append(f"{name}_sum{labels} {entry['sum']}")
+                lines.append(f"{name}_count{labels} {entry['count']}")
+        return "\n".join(lines) + "\n"
+
+    def _notify(self, name: str, value: float, labels: dict) -> None:
+        """Call the listeners with a recorded value.
+
+        Args:
+            name (str): name of the metric
+            value (float): the recorded value
+            labels (dict): labels of the metric
+        """
+        for listener in self.listeners:
+            listener(name, value, labels)
+
+
+def format_labels(labels: dict) -> str:
+    """Format labels for the Prometheus text format.
+
+    Args:
+        labels (dict): label names and values
+
+    Returns:
+        str: labels in curly braces, or an empty string without labels
+    """
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{escape_label_value(str(value))}"'
+        for name, value in sorted(labels.items())
+    )
+    return f"{{{pairs}}}"
+
+
+def escape_label_value(value: str) -> str:
+    """Escape backslashes, quotes and newlines of a label value.
+
+    Args:
+        value (str): the label value
+
+    Returns:
+        str: the escaped value
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Shared by all components which are not given their own Metrics
+DEFAULT_METRICS = Metrics()
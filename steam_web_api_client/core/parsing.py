@@ -0,0 +1,242 @@
+"""Filter and format information returned from Steam Web API."""
+
+import datetime
+import os
+import re
+
+PERSONA_STATES = ("Offline", "Online", "Busy", "AFK", "Snooze")
+SUMMARIES_BATCH_SIZE = 100
+STEAMID_PATTERN = re.compile(r"\d{17}")
+PROFILE_URL_PATTERN = re.compile(
+    r"(?:https?://)?(?:www\.)?steamcommunity\.com/(profiles|id)/([^/?#]+)(?:[/?#].*)?",
+    re.IGNORECASE,
+)
+VANITY_NAME_PATTERN = re.compile(r"[A-Za-z0-9_-]{2,32}")
+
+
+def parse_username(summaries: dict) -> str:
+    """Filter and return the username.
+
+    Args:
+        summaries (dict): data containing the fetched information about user
+
+    Returns:
+        str: username
+    """
+    return summaries["response"]["players"][0]["personaname"]
+
+
+def parse_steamid(summaries: dict) -> str:
+    """Filter and return the steam ID.
+
+    Args:
+        summaries (dict): data containing the fetched information about user
+
+    Returns:
+        str: steam ID
+    """
+    return summaries["response"]["players"][0]["steamid"]
+
+
+def parse_user_status(summaries: dict) -> str:
+    """Filter, process and return user status.
+
+    Args:
+        summaries (dict): data containing the fetched information about user
+
+    Returns:
+        str: status of user
+    """
+    return get_user_status(summaries["response"]["players"][0])
+
+
+def parse_last_logoff(summaries: dict) -> str:
+    """Filter, process and return the time the user last logged off.
+
+    Args:
+        summaries (dict): data containing the fetched information about user
+
+    Returns:
+        str: the time the user last logged off
+    """
+    return get_last_logoff(summaries["response"]["players"][0])
+
+
+def parse_players(summaries: dict) -> dict:
+    """Filter and process every user contained in a summary.
+
+    Args:
+        summaries (dict): data containing the fetched information about users
+
+    Returns:
+        dict: username, status, last logoff and avatar url per steam ID
+    """
+    return {
+        player["steamid"]: {
+            "username": player["personaname"],
+            "status": get_user_status(player),
+            "last_logoff": get_last_logoff(player),
+            "avatar_url": player["avatar"],
+        }
+        for player in summaries["response"]["players"]
+    }
+
+
+def parse_friend_ids(friends: dict) -> list:
+    """Filter and return the steam IDs of a friend list.
+
+    Args:
+        friends (dict): data containing the fetched friend list of an user
+
+    Returns:
+        list: steam IDs of the friends
+    """
+    return [
+        friend["steamid"]
+        for friend in friends.get("friendslist", {}).get("friends", [])
+    ]
+
+
+def parse_vanity_url(resolved: dict) -> str:
+    """Filter and return the steam ID a vanity name was resolved to.
+
+    Args:
+        resolved (dict): data containing the fetched information about a name
+
+    Returns:
+        str: steam ID, or None if no user has the name
+    """
+    response = resolved["response"]
+    return response["steamid"] if response.get("success") == 1 else None
+
+
+def normalize_identifier(identifier: str) -> tuple:
+    """Recognize a 64-bit steam ID, a profile url or a vanity name.
+
+    Args:
+        identifier (str): input of the user, e.g. 7656119...,
+            https://steamcommunity.com/id/name/ or name
+
+    Returns:
+        tuple: "steamid" or "vanity" and the value, or None if not recognized
+    """
+    identifier = identifier.strip()
+    match = PROFILE_URL_PATTERN.fullmatch(identifier)
+    if match:
+        kind, identifier = match.groups()
+        if kind.lower() == "profiles":
+            return (
+                ("steamid", identifier)
+                if STEAMID_PATTERN.fullmatch(identifier)
+                else None
+            )
+    elif STEAMID_PATTERN.fullmatch(identifier):
+        return ("steamid", identifier)
+    if VANITY_NAME_PATTERN.fullmatch(identifier):
+        # Vanity names are case-insensitive
+        return ("vanity", identifier.lower())
+    return None
+
+
+def batch_steamids(steamids: list) -> list:
+    """Join steam IDs into comma separated batches accepted by GetPlayerSummaries.
+
+    Args:
+        steamids (list): steam IDs of users
+
+    Returns:
+        list: strings of at most SUMMARIES_BATCH_SIZE comma separated steam IDs
+    """
+    steamids = [str(steamid) for steamid in steamids]
+    return [
+        ",".join(steamids[i : i + SUMMARIES_BATCH_SIZE])
+        for i in range(0, len(steamids), SUMMARIES_BATCH_SIZE)
+    ]
+
+
+def get_user_status(player: dict) -> str:
+    """Process and return the status of a single user.
+
+    Args:
+        player (dict): data containing the fetched information about one user
+
+    Returns:
+        str: status of user
+    """
+    state = player["personastate"]
+    if 0 <= state < len(PERSONA_STATES):
+        return PERSONA_STATES[state]
+    return ""
+
+
+def get_last_logoff(player: dict) -> str:
+    """Process and return the time a single user last logged off.
+
+    Args:
+        player (dict): data containing the fetched information about one user
+
+    Returns:
+        str: the time the user last logged off
+    """
+    try:
+        last_logoff = player["lastlogoff"]
+    except KeyError as e:
+        print(f"[Warning] KeyError: {e}")
+        return "N/A"
+
+    time = datetime.datetime.fromtimestamp(last_logoff)
+    return time.strftime("%d.%m.%Y %H:%M")
+
+
+def format_playtime(minutes: int) -> str:
+    """Format a playtime in minutes as hours and minutes.
+
+    Args:
+        minutes (int): playtime in minutes
+
+    Returns:
+        str: formatted playtime
+    """
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:4}h {minutes:02}min"
+
+
+def get_icon_url(appid: int, icon_hash: str) -> str:
+    """Build the url of a game icon.
+
+    Args:
+        appid (int): app ID of the game
+        icon_hash (str): hash of the game icon
+
+    Returns:
+        str: url of the game icon
+    """
+    return (
+        f"http://media.steampowered.com/steamcommunity/"
+        f"public/images/apps/{appid}/{icon_hash}.jpg"
+    )
+
+
+def get_icon_key(appid: int, icon_hash: str) -> str:
+    """Build the media cache key of a game icon.
+
+    Args:
+        appid (int): app ID of the game
+        icon_hash (str): hash of the game icon
+
+    Returns:
+        str: app ID and icon hash of the game
+    """
+    return f"{appid}_{icon_hash}"
+
+
+def get_avatar_key(avatar_url: str) -> str:
+    """Build the media cache key of an avatar.
+
+    Args:
+        avatar_url (str): url of the avatar
+
+    Returns:
+        str: hash contained in the avatar url
+    """
+    return os.path.splitext(os.path.basename(avatar_url))[0]
@@ -0,0 +1,203 @@
+"""Record playtime snapshots over time and query their history."""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+from steam_web_api_client.core.game_table import GameTable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS latest (
+    steam_id INTEGER NOT NULL,
+    appid INTEGER NOT NULL,
+    playtime_forever INTEGER NOT NULL,
+    recorded_at INTEGER NOT NULL,
+    PRIMARY KEY (steam_id, appid)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS changes (
+    steam_id INTEGER NOT NULL,
+    recorded_at INTEGER NOT NULL,
+    appid INTEGER NOT NULL,
+    delta INTEGER NOT NULL,
+    PRIMARY KEY (steam_id, recorded_at, appid)
+) WITHOUT ROWID;
+"""
+
+
+class PlaytimeHistory:
+    """Store playtime_forever per user and app as a delta-encoded time series.
+
+    The first value seen for a game is kept as baseline in the latest table.
+    Afterwards a row holding the added minutes is written to the changes
+    table only when the value changed, so idle accounts cost no space.
+
+    Attributes:
+        db_path: A string containing the path of the SQLite database
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def record(self, steam_id: int, games: GameTable, recorded_at: int = None) -> int:
+        """Store the playtimes of a snapshot which differ from the last one.
+
+        Args:
+            steam_id (int): steam ID of the user
+            games (GameTable): the games of the snapshot
+            recorded_at (int): unix time of the snapshot, defaults to now
+
+        Returns:
+            int: amount of changed games
+        """
+        steam_id = int(steam_id)
+        recorded_at = int(recorded_at if recorded_at is not None else time.time())
+        changed = 0
+        with self._lock, self._connection:
+            latest = dict(
+                self._connection.execute(
+                    "SELECT appid, playtime_forever FROM latest WHERE steam_id = ?",
+                    (steam_id,),
+                )
+            )
+            for record in games:
+                previous = latest.get(record.appid)
+                if previous == record.playtime_forever:
+                    continue
+                if previous is not None:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO changes "
+                        "(steam_id, recorded_at, appid, delta) VALUES (?, ?, ?, ?)",
+                        (
+                            steam_id,
+                            recorded_at,
+                            record.appid,
+                            record.playtime_forever - previous,
+                        ),
+                    )
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO latest "
+                    "(steam_id, appid, playtime_forever, recorded_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (steam_id, record.appid, record.playtime_forever, recorded_at),
+                )
+                changed += 1
+        return changed
+
+    def hours_per_day(
+        self, steam_id: int, days: int = 90, appid: int = None, now: int = None
+    ) -> Iterator:
+        """Yield the played hours per day of an user.
+
+        The changes are summed up by SQLite, only one row per day is handed
+        back instead of the whole history.
+
+        Args:
+            steam_id (int): steam ID of the user
+            days (int): amount of days to look back
+            appid (int): only count this game, defaults to all games
+            now (int): unix time the range ends at, defaults to now
+
+        Yields:
+            tuple: date as "YYYY-MM-DD" and played hours on that day
+        """
+        end = int(now if now is not None else time.time())
+        query = (
+            "SELECT date(recorded_at, 'unixepoch', 'localtime') AS day, "
+            "SUM(delta) / 60.0 FROM changes "
+            "WHERE steam_id = ? AND recorded_at > ? AND recorded_at <= ?"
+        )
+        params = [int(steam_id), end - days * 86400, end]
+        if appid is not None:
+            query += " AND appid = ?"
+            params.append(int(appid))
+        query += " GROUP BY day ORDER BY day"
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        yield from rows
+
+    def get_playtime(self, steam_id: int, appid: int) -> int:
+        """Return the last recorded playtime of a game.
+
+        Args:
+            steam_id (int): steam ID of the user
+            appid (int): app ID of the game
+
+        Returns:
+            int: playtime in minutes, or 0 if the game was never recorded
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT playtime_forever FROM latest WHERE steam_id = ? AND appid = ?",
+                (int(steam_id), int(appid)),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class PlaytimeRecorder:
+    """Poll recently played games of many users and record their playtimes.
+
+    Attributes:
+        steam_api: A SteamAPI used for the API calls
+        history: A PlaytimeHistory storing the snapshots
+        steam_ids: A list holding the steam IDs to monitor
+        interval: A float holding the seconds between two polls
+        max_workers: An integer limiting the amount of concurrent API calls
+    """
+
+    def __init__(
+        self,
+        steam_api,
+        history: PlaytimeHistory,
+        steam_ids: list,
+        interval: float = 15 * 60,
+        max_workers: int = 4,
+    ):
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.steam_api = steam_api
+        self.history = history
+        self.steam_ids = list(steam_ids)
+        self.interval = interval
+        self.max_workers = max_workers
+
+    def poll(self) -> int:
+        """Take one snapshot of every monitored user.
+
+        Returns:
+            int: amount of changed games
+        """
+        recorded_at = int(time.time())
+
+        def record(steam_id):
+            # A cached response would record an outdated snapshot again
+            games = self.steam_api.get_recently_played_games(
+                steamid=steam_id, refresh=True
+            )
+            if not games or not games["response"]:
+                return 0
+            return self.history.record(
+                steam_id, GameTable.from_response(games), recorded_at
+            )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return sum(executor.map(record, self.steam_ids))
+
+    def run(self, stop_event: threading.Event) -> None:
+        """Poll every interval seconds until stop_event is set.
+
+        Args:
+            stop_event (threading.Event): ends the loop when set
+        """
+        while not stop_event.is_set():
+            changed = self.poll()
+            print(f"[INFO] Recorded {changed} changed playtimes")
+            stop_event.wait(self.interval)
@@ -0,0 +1,179 @@
+"""Throttle requests and retry them with backoff."""
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """Allow a steady rate of requests with short bursts.
+
+    Attributes:
+        rate: A float holding the amount of tokens added per second
+        capacity: A float limiting the amount of stored tokens
+        tokens: A float holding the currently available tokens
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        while wait_time := self._take():
+            time.sleep(wait_time)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a token is available."""
+        while wait_time := self._take():
+            await asyncio.sleep(wait_time)
+
+    def _take(self) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, else the seconds until the next one
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if now >= self._paused_until and self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return max(self._paused_until - now, (1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for a while, e.g. after the server asked to wait.
+
+        Args:
+            seconds (float): duration of the pause
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+class AdaptiveConcurrency:
+    """Limit concurrent requests, halving the limit on errors.
+
+    The limit grows by one for every limit successful requests in a row and
+    is halved whenever a request is throttled or fails (AIMD).
+
+    Attributes:
+        min_limit: An integer holding the lowest allowed limit
+        max_limit: An integer holding the highest allowed limit
+        limit: A float holding the current limit
+        in_flight: An integer counting the running requests
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        """Raise the limit additively."""
+        with self._condition:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    def on_error(self) -> None:
+        """Lower the limit multiplicatively."""
+        with self._condition:
+            self.limit = max(self.min_limit, self.limit / 2)
+
+
+class RetryPolicy:
+    """Decide how often and how long to wait before retrying a request.
+
+    Attributes:
+        max_retries: An integer limiting the amount of retries per request
+        base_delay: A float holding the delay before the first retry in seconds
+        max_delay: A float limiting the delay between retries in seconds
+        retry_statuses: A set of HTTP status codes which are retried
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        retry_statuses: tuple = (429, 500, 502, 503, 504),
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = set(retry_statuses)
+
+    def should_retry(self, status_code: int) -> bool:
+        """Check if a response with the given status code is retried.
+
+        Args:
+            status_code (int): HTTP status code of the response
+
+        Returns:
+            bool: True if the request should be retried
+        """
+        return status_code in self.retry_statuses
+
+    def get_delay(self, attempt: int, retry_after: float = None) -> float:
+        """Return the delay before the next attempt.
+
+        Uses exponential backoff with full jitter, but never less than the
+        server asked for with Retry-After.
+
+        Args:
+            attempt (int): number of the failed attempt, starting at 0
+            retry_after (float): seconds requested by the server, or None
+
+        Returns:
+            float: delay in seconds
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+def parse_retry_after(value: str) -> float:
+    """Parse the Retry-After header.
+
+    Args:
+        value (str): seconds or an HTTP date
+
+    Returns:
+        float: seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_date.timestamp() - time.time())
@@ -0,0 +1,175 @@
+"""Cache responses of the Steam Web API to avoid duplicate calls."""
+
+import json
+import shelve
+import threading
+import time
+from typing import Callable
+
+from cachetools import TTLCache
+
+DEFAULT_TTLS = {
+    "ISteamUser.GetFriendList": 60 * 60,
+    "ISteamUser.GetPlayerSummaries": 60,
+    "ISteamUser.ResolveVanityURL": 60 * 60,
+    "IPlayerService.GetOwnedGames": 60 * 60,
+    "IPlayerService.GetRecentlyPlayedGames": 15 * 60,
+}
+
+
+class ResponseCache:
+    # pylint: disable=too-many-instance-attributes
+    """Keep API responses in memory, and optionally on disk, for a limited time.
+
+    Every API method gets its own TTLCache, so frequently changing data like
+    the user status can expire sooner than library data.
+
+    Attributes:
+        ttls: A dictionary holding the time to live in seconds per API method
+        default_ttl: A float holding the time to live of methods not in ttls
+        maxsize: An integer limiting the amount of cached responses per method
+        store_path: A string containing the path of the persistent store, or None
+        hits: An integer counting the responses served from the cache
+        misses: An integer counting the responses that had to be fetched
+    """
+
+    def __init__(
+        self,
+        ttls: dict = None,
+        default_ttl: float = 5 * 60,
+        maxsize: int = 1024,
+        store_path: str = None,
+    ):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        self.store_path = store_path
+        self.hits = 0
+        self.misses = 0
+        self._caches = {}
+        self._lock = threading.Lock()
+        self._store = None
+        if store_path:
+            self._store = shelve.open(store_path)
+            self.prune()
+
+    def prune(self) -> None:
+        """Remove expired responses from the persistent store."""
+        with self._lock:
+            if self._store is None:
+                return
+            now = time.time()
+            for key in list(self._store.keys()):
+                if self._store[key][0] <= now:
+                    del self._store[key]
+
+    def get(self, method: str, params: dict):
+        """Return a cached response.
+
+        Args:
+            method (str): interface and method of the API call
+            params (dict): parameters of the API call
+
+        Returns:
+            The cached response, or None if it is missing or expired
+        """
+        key = self.make_key(method, params)
+        with self._lock:
+            cache = self._get_cache(method)
+            if key in cache:
+                return cache[key]
+            if self._store is not None and key in self._store:
+                expires_at, response = self._store[key]
+                if expires_at > time.time():
+                    return response
+                del self._store[key]
+        return None
+
+    def put(self, method: str, params: dict, response) -> None:
+        """Store a response.
+
+        Args:
+            method (str): interface and method of the API call
+            params (dict): parameters of the API call
+            response: the response to cache
+        """
+        key = self.make_key(method, params)
+        with self._lock:
+            self._get_cache(method)[key] = response
+            if self._store is not None:
+                self._store[key] = (time.time() + self.get_ttl(method), response)
+
+    def get_or_fetch(self, method: str, params: dict, fetch: Callable):
+        """Return a cached response or fetch and cache it.
+
+        Args:
+            method (str): interface and method of the API call
+            params (dict): parameters of the API call
+            fetch (Callable): performs the API call if the response isn't cached
+
+        Returns:
+            The cached or fetched response
+        """
+        response = self.get(method, params)
+        with self._lock:
+            if response is not None:
+                self.hits += 1
+                return response
+            self.misses += 1
+        response = fetch()
+        if response is not None:
+            self.put(method, params, response)
+        return response
+
+    def get_ttl(self, method: str) -> float:
+        """Return the time to live of an API method.
+
+        Args:
+            method (str): interface and method of the API call
+
+        Returns:
+            float: time to live in seconds
+        """
+        return self.ttls.get(method, self.default_ttl)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of responses served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self) -> None:
+        """Write and close the persistent store."""
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+
+    def _get_cache(self, method: str) -> TTLCache:
+        """Return the in-memory cache of an API method, creating it if needed.
+
+        Args:
+            method (str): interface and method of the API call
+
+        Returns:
+            TTLCache: the cache of the method
+        """
+        if method not in self._caches:
+            self._caches[method] = TTLCache(
+                maxsize=self.maxsize, ttl=self.get_ttl(method)
+            )
+        return self._caches[method]
+
+    @staticmethod
+    def make_key(method: str, params: dict) -> str:
+        """Build the cache key of an API call.
+
+        Args:
+            method (str): interface and method of the API call
+            params (dict): parameters of the API call
+
+        Returns:
+            str: method and sorted parameters
+        """
+        params = {name: str(value) for name, value in params.items()}
+        return f"{method}?{json.dumps(params, sort_keys=True)}"
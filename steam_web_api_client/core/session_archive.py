@@ -0,0 +1,193 @@
+"""Record HTTP responses into one indexed file and replay them offline.
+
+Layout of an archive:
+    header   magic and format version
+    bodies   the response bodies, appended while recording
+    index    per response its key, body offset and length, status and latency
+    footer   offset of the index, amount of entries, magic
+
+Bodies are streamed to disk while recording, only the index is kept in
+memory. Replaying memory-maps the file and reads the bodies on demand.
+"""
+
+import mmap
+import os
+import struct
+import threading
+from urllib.parse import urlencode
+
+MAGIC = b"SWAR"
+VERSION = 1
+HEADER = struct.Struct("<4sI")
+# Key length, body offset, body length, HTTP status, latency in microseconds
+ENTRY = struct.Struct("<IQIHI")
+FOOTER = struct.Struct("<QI4s")
+
+# Query parameters left out of the keys, so no api key ends up in an archive
+SECRET_PARAMS = frozenset(("key",))
+
+
+class ArchivedResponse:
+    # pylint: disable=too-few-public-methods
+    """Response as it was recorded.
+
+    Attributes:
+        status: An integer holding the HTTP status code
+        body: Bytes holding the response body
+        latency: A float holding the seconds the live request took
+    """
+
+    __slots__ = ("status", "body", "latency")
+
+    def __init__(self, status: int, body: bytes, latency: float):
+        self.status = status
+        self.body = body
+        self.latency = latency
+
+
+class SessionArchive:
+    """Store responses of a session by request and hand them out again.
+
+    A request sent several times while recording, e.g. by a refresh, is
+    replayed in the same order, the last response is repeated afterwards.
+
+    Attributes:
+        path: A string containing the path of the archive file
+        mode: A string holding "w" to record or "r" to replay
+    """
+
+    def __init__(self, path: str, mode: str = "r"):
+        self.path = path
+        self.mode = mode
+        self._index = {}
+        self._replayed = {}
+        self._lock = threading.Lock()
+        self._mmap = None
+        if mode == "w":
+            # pylint: disable-next=consider-using-with
+            self._file = open(file=path, mode="wb")
+            self._file.write(HEADER.pack(MAGIC, VERSION))
+        elif mode == "r":
+            self._file = None
+            with open(file=path, mode="rb") as archive_file:
+                # An empty file can't be mapped, it is rejected by _read_index
+                if os.fstat(archive_file.fileno()).st_size:
+                    self._mmap = mmap.mmap(
+                        archive_file.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+            try:
+                self._read_index()
+            except ValueError:
+                self.close()
+                raise
+        else:
+            raise ValueError(f"Invalid mode {mode!r}, expected 'r' or 'w'")
+
+    @staticmethod
+    def make_key(url: str, params: dict = None) -> str:
+        """Build the key of a request.
+
+        Args:
+            url (str): url of the resource
+            params (dict): query parameters of the request
+
+        Returns:
+            str: url with the sorted query parameters, without secrets
+        """
+        params = sorted(
+            (name, str(value))
+            for name, value in (params or {}).items()
+            if name not in SECRET_PARAMS
+        )
+        return f"{url}?{urlencode(params)}" if params else url
+
+    def record(self, key: str, status: int, body: bytes, latency: float) -> None:
+        """Append a response.
+
+        Args:
+            key (str): key of the request built by make_key()
+            status (int): HTTP status code
+            body (bytes): response body
+            latency (float): seconds the request took
+        """
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(body)
+            self._index.setdefault(key, []).append(
+                (offset, len(body), status, int(latency * 1_000_000))
+            )
+
+    def lookup(self, key: str) -> ArchivedResponse:
+        """Return the next recorded response of a request.
+
+        Args:
+            key (str): key of the request built by make_key()
+
+        Returns:
+            ArchivedResponse: the response, or None if it wasn't recorded
+        """
+        with self._lock:
+            entries = self._index.get(key)
+            if not entries:
+                return None
+            position = self._replayed.get(key, 0)
+            self._replayed[key] = position + 1
+            offset, length, status, latency = entries[min(position, len(entries) - 1)]
+        return ArchivedResponse(
+            status, self._mmap[offset : offset + length], latency / 1_000_000
+        )
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._index.values())
+
+    def _read_index(self) -> None:
+        """Check header and footer and load the index of a mapped archive."""
+        size = len(self._mmap) if self._mmap is not None else 0
+        if size < HEADER.size + FOOTER.size:
+            raise ValueError(f"{self.path} is no complete session archive")
+        magic, version = HEADER.unpack_from(self._mmap, 0)
+        index_end = size - FOOTER.size
+        index_offset, count, end_magic = FOOTER.unpack_from(self._mmap, index_end)
+        if (
+            magic != MAGIC
+            or end_magic != MAGIC
+            or version != VERSION
+            or not HEADER.size <= index_offset <= index_end
+        ):
+            raise ValueError(f"{self.path} is no complete session archive")
+        position = index_offset
+        for _ in range(count):
+            if position + ENTRY.size > index_end:
+                raise ValueError(f"{self.path} is no complete session archive")
+            key_length, offset, length, status, latency = ENTRY.unpack_from(
+                self._mmap, position
+            )
+            position += ENTRY.size
+            if position + key_length > index_end or offset + length > index_offset:
+                raise ValueError(f"{self.path} is no complete session archive")
+            key = self._mmap[position : position + key_length].decode("utf-8")
+            position += key_length
+            self._index.setdefault(key, []).append((offset, length, status, latency))
+
+    def close(self) -> None:
+        """Write the index of a recording, or unmap the replayed archive."""
+        with self._lock:
+            if self._file is not None:
+                index_offset = self._file.tell()
+                count = 0
+                for key, entries in self._index.items():
+                    encoded_key = key.encode("utf-8")
+                    for offset, length, status, latency in entries:
+                        self._file.write(
+                            ENTRY.pack(
+                                len(encoded_key), offset, length, status, latency
+                            )
+                        )
+                        self._file.write(encoded_key)
+                        count += 1
+                self._file.write(FOOTER.pack(index_offset, count, MAGIC))
+                self._file.close()
+                self._file = None
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
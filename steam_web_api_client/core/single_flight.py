@@ -0,0 +1,85 @@
+"""Share one in-flight fetch between concurrent requests for the same key."""
+
+import threading
+from typing import Callable, Hashable
+
+
+class Flight:
+    # pylint: disable=too-few-public-methods
+    """Fetch in progress whose result is shared by all waiting requests.
+
+    Attributes:
+        done: A threading.Event set when the fetch has finished
+        result: The value returned by the fetch
+        error: The exception raised by the fetch, or None
+    """
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run a fetch only once while it is in flight.
+
+    The first request of a key runs the fetch, requests arriving before it
+    has finished wait for it and get the same result or exception. Once
+    finished the key is forgotten, caching results is left to the caches.
+
+    Attributes:
+        coalesced: An integer counting the requests served by another fetch
+        on_coalesced: An optional callable called with the key of every
+            coalesced request, e.g. to record metrics
+    """
+
+    def __init__(self, on_coalesced: Callable = None):
+        self.coalesced = 0
+        self.on_coalesced = on_coalesced
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fetch: Callable):
+        """Return the result of fetch, shared with concurrent requests of key.
+
+        Args:
+            key (Hashable): identifies equal requests
+            fetch (Callable): performs the request
+
+        Returns:
+            The value returned by fetch
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Flight()
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                flight.result = fetch()
+            except Exception as e:
+                flight.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+            return flight.result
+
+        if self.on_coalesced is not None:
+            self.on_coalesced(key)
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    @property
+    def in_flight(self) -> int:
+        """Amount of fetches currently running."""
+        with self._lock:
+            return len(self._flights)
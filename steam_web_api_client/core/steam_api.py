@@ -1,51 +1,167 @@
-"""Fetch and save information from Steam Web API"""
+"""Fetch and save information from Steam Web API
 
-import datetime
-import io
-import urllib.error
-import urllib.request
+Pillow and tkinter are only imported when images are decoded, so the API
+calls can be used headless.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+from urllib.parse import urlparse
 
 import requests
-from PIL import Image, ImageTk
-from steam.webapi import WebAPI
+
+from steam_web_api_client.core import parsing
+from steam_web_api_client.core.game_table import GameTable
+from steam_web_api_client.core.image_pipeline import ImagePipeline, Thumbnail
+from steam_web_api_client.core.media_cache import MediaCache
+from steam_web_api_client.core.metrics import DEFAULT_METRICS, SIZE_BUCKETS, Metrics
+from steam_web_api_client.core.response_cache import ResponseCache
+from steam_web_api_client.core.single_flight import SingleFlight
+from steam_web_api_client.core.transport import HTTPTransport
+
+# Versions of the called methods, requested directly without interface discovery
+ENDPOINTS = {
+    "ISteamUser.GetFriendList": 1,
+    "ISteamUser.GetPlayerSummaries": 2,
+    "ISteamUser.ResolveVanityURL": 1,
+    "IPlayerService.GetOwnedGames": 1,
+    "IPlayerService.GetRecentlyPlayedGames": 1,
+}
 
 
 class SteamAPI:
+    # pylint: disable=too-many-instance-attributes
     """Save, process and return information from Steam Web API.
 
     Attributes:
         api_key = A string holding the value of the steam api key
-        api = An object using the api_key to access the API
-        image_list = A list holding icons returned from the API
-        name_list = A list holding game titles returned from the API
-        playtime_2weeks_list = A list holding playtime in last 2 weeks values returned from the API
-        playtime_forever_list = A list holding overall playtime values returned from the API
+        api_url = A string holding the base url of the Steam Web API
+        max_workers = An integer limiting the amount of concurrent icon downloads
+        media_cache = An optional MediaCache storing downloaded icons and avatars
+        transport = An HTTPTransport shared by API calls and media downloads
+        response_cache = An optional ResponseCache holding recent API responses
+        image_pipeline = An ImagePipeline shrinking icons and avatars to display size
+        metrics = A Metrics recording latencies, sizes, errors and cache hit rates
+        api_calls = A SingleFlight sharing identical API calls which are in flight
+        media_fetches = A SingleFlight sharing downloads of the same image url
     """
 
-    def __init__(self, api_key: str):
-        self.api = WebAPI(key=api_key)
-        self.avatar_list = []
-        self.username_list = []
-        self.image_list = []
-        self.name_list = []
-        self.playtime_2weeks_list = []
-        self.playtime_forever_list = []
+    def __init__(
+        self,
+        api_key: str,
+        max_workers: int = 8,
+        media_cache: MediaCache = None,
+        transport: HTTPTransport = None,
+        response_cache: ResponseCache = None,
+        image_pipeline: ImagePipeline = None,
+        metrics: Metrics = None,
+    ):
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.api_key = api_key
+        self.api_url = "https://api.steampowered.com"
+        self.max_workers = max_workers
+        self.media_cache = media_cache
+        self.transport = transport or HTTPTransport(pool_size=max_workers)
+        self.response_cache = response_cache
+        self.image_pipeline = image_pipeline or ImagePipeline()
+        self.metrics = metrics or DEFAULT_METRICS
+        self.transport.session.hooks["response"].append(self.record_response)
+        self.api_calls = SingleFlight(
+            on_coalesced=lambda key: self.metrics.increment(
+                "coalesced_requests_total", kind="api"
+            )
+        )
+        self.media_fetches = SingleFlight(
+            on_coalesced=lambda key: self.metrics.increment(
+                "coalesced_requests_total", kind="media"
+            )
+        )
+        if self.response_cache is not None:
+            self.metrics.register_gauge(
+                "response_cache_hit_rate", lambda: self.response_cache.hit_rate
+            )
+        if self.media_cache is not None:
+            self.metrics.register_gauge(
+                "media_cache_hit_rate", lambda: self.media_cache.hit_rate
+            )
+
+    def call(self, method: str, refresh: bool = False, **params) -> dict:
+        """Call a method of the Steam Web API, served from the cache if possible.
+
+        Args:
+            method (str): interface and method, e.g. "ISteamUser.GetPlayerSummaries"
+            refresh (bool): skip the cache and store the fresh response in it
+
+        Returns:
+            dict: data containing the fetched information
+        """
+        with self.metrics.timer("steam_api_call", method=method):
+            if self.response_cache is None:
+                return self.request(method, **params)
+            if refresh:
+                response = self.request(method, **params)
+                self.response_cache.put(method, params, response)
+                return response
+            return self.response_cache.get_or_fetch(
+                method, params, lambda: self.request(method, **params)
+            )
+
+    def request(self, method: str, **params) -> dict:
+        """Send a request to a method of the Steam Web API.
+
+        Concurrent identical requests share the response, or the error, of
+        the first one instead of being sent again.
+
+        Args:
+            method (str): interface and method, e.g. "ISteamUser.GetPlayerSummaries"
+
+        Returns:
+            dict: data containing the fetched information
+        """
+        interface, method_name = method.split(".")
+        version = ENDPOINTS.get(method, 1)
+        return self.api_calls.do(
+            ResponseCache.make_key(method, params),
+            lambda: self.transport.get_json(
+                f"{self.api_url}/{interface}/{method_name}/v{version}/",
+                params={"key": self.api_key, "format": "json", **params},
+            ),
+        )
 
-    def get_recently_played_games(self, steamid: int) -> dict:
+    def record_response(self, response, *args, **kwargs) -> None:
+        """Record the payload size of every HTTP response, used as session hook.
+
+        Args:
+            response (requests.Response): the received response
+        """
+        # pylint: disable=unused-argument
+        host = urlparse(response.url).netloc
+        self.metrics.increment(
+            "http_responses_total", host=host, status=response.status_code
+        )
+        self.metrics.observe(
+            "http_response_bytes",
+            len(response.content),
+            buckets=SIZE_BUCKETS,
+            host=host,
+        )
+
+    def get_recently_played_games(self, steamid: int, refresh: bool = False) -> dict:
         """Fetch and return recently played games from API.
 
         Args:
             steamid (int): steam ID of user to fetch information
+            refresh (bool): bypass the response cache
 
         Returns:
             dict: data containing the fetched information
         """
         try:
-            response = self.api.call(
+            response = self.call(
                 "IPlayerService.GetRecentlyPlayedGames",
+                refresh=refresh,
                 steamid=steamid,
                 count=50,
-                format="json",
             )
 
             if not response["response"]:
@@ -53,61 +169,168 @@ class SteamAPI:
 
             return response
 
-        except requests.exceptions.HTTPError as http_err:
-            # Handle HTTP errors
+        except requests.exceptions.RequestException as http_err:
+            # Handle HTTP and connection errors left after retrying
             print(f"HTTPError: {http_err}")
             return None
 
-    def get_player_summaries(self, steamid: int) -> dict:
+    def get_player_summaries(self, steamid: int, refresh: bool = False) -> dict:
         """Fetch and return summary of an user from API.
 
         Args:
             steamid (int): steam ID of user to fetch information
+            refresh (bool): bypass the response cache
 
         Returns:
             dict: data containing the fetched information
         """
         try:
-            response = self.api.call(
-                "ISteamUser.GetPlayerSummaries", steamids=steamid, format="json"
+            response = self.call(
+                "ISteamUser.GetPlayerSummaries",
+                refresh=refresh,
+                steamids=steamid,
             )
             return response
 
-        except requests.exceptions.HTTPError as http_err:
-            # Handle HTTP errors
+        except requests.exceptions.RequestException as http_err:
+            # Handle HTTP and connection errors left after retrying
             print(f"HTTPError: {http_err}")
             print("No access to this data! The profile may be private!")
             return None
 
-    def fetch_avatar(self, summaries: dict) -> None:
-        """Filter and process the avatar of an user.
+    def get_owned_games(
+        self, steamid: int, include_appinfo: bool = True, refresh: bool = False
+    ) -> dict:
+        """Fetch and return the whole library of an user from API.
 
         Args:
-            summaries (dict): data containing the fetched information about user
+            steamid (int): steam ID of user to fetch information
+            include_appinfo (bool): include names and icon hashes of the games
+            refresh (bool): bypass the response cache
 
         Returns:
-            ImageTk.PhotoImage: processed image of user avatar
+            dict: data containing the fetched information
+        """
+        try:
+            response = self.call(
+                "IPlayerService.GetOwnedGames",
+                refresh=refresh,
+                steamid=steamid,
+                include_appinfo=int(include_appinfo),
+                include_played_free_games=1,
+            )
+
+            if not response["response"]:
+                print("[WARNING] No access to this data! The profile may be private!")
+
+            return response
+
+        except requests.exceptions.RequestException as http_err:
+            # Handle HTTP and connection errors left after retrying
+            print(f"HTTPError: {http_err}")
+            return None
+
+    def get_friend_list(self, steamid: int) -> dict:
+        """Fetch and return the friends of an user from API.
+
+        Args:
+            steamid (int): steam ID of user to fetch information
+
+        Returns:
+            dict: data containing the fetched information, empty for private
+                lists, None on errors
         """
-        avatar_url = summaries["response"]["players"][0]["avatar"]
         try:
-            with urllib.request.urlopen(avatar_url, timeout=10) as image_data:
-                image_file = io.BytesIO(image_data.read())
-            img = ImageTk.PhotoImage(Image.open(image_file))
-            self.avatar_list.append(img)
-        except (urllib.error.URLError, urllib.error.HTTPError) as e:
-            print("Error fetching avatar:", e)
-            self.avatar_list.append(None)
+            return self.call(
+                "ISteamUser.GetFriendList", steamid=steamid, relationship="friend"
+            )
+
+        except requests.exceptions.HTTPError as http_err:
+            print(f"HTTPError: {http_err}")
+            # Private friend lists are answered with 401 Unauthorized
+            if http_err.response is not None and http_err.response.status_code == 401:
+                return {}
+            return None
+
+        except requests.exceptions.RequestException as http_err:
+            print(f"HTTPError: {http_err}")
+            return None
+
+    def resolve_vanity_url(self, vanity_name: str) -> dict:
+        """Fetch and return the steam ID of a vanity name from API.
+
+        Args:
+            vanity_name (str): custom url name of an user profile
+
+        Returns:
+            dict: data containing the fetched information, None on errors
+        """
+        try:
+            return self.call(
+                "ISteamUser.ResolveVanityURL", vanityurl=vanity_name, url_type=1
+            )
+
+        except requests.exceptions.RequestException as http_err:
+            # Handle HTTP and connection errors left after retrying
+            print(f"HTTPError: {http_err}")
+            return None
+
+    def get_player_summaries_bulk(self, steamids: list) -> dict:
+        """Fetch and return summaries of many users in batches of 100.
+
+        Args:
+            steamids (list): steam IDs of users to fetch information
 
-    def fetch_username(self, summaries: dict) -> str:
-        """Filter and return the username.
+        Returns:
+            dict: username, status, last logoff and avatar url per steam ID
+        """
+        batches = parsing.batch_steamids(steamids)
+        profiles = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for summaries in executor.map(self.get_player_summaries, batches):
+                if summaries:
+                    profiles.update(parsing.parse_players(summaries))
+        return profiles
+
+    def get_profile(
+        self, steamid: int, on_summary: Callable = None, on_avatar: Callable = None
+    ) -> tuple:
+        """Fetch recently played games and summary of an user at the same time.
+
+        The avatar download starts as soon as the summary arrives, if
+        on_avatar is given.
+
+        Args:
+            steamid (int): steam ID of user to fetch information
+            on_summary (Callable): called with the summary as soon as it arrives
+            on_avatar (Callable): called with the decoded avatar as soon as it arrives
+
+        Returns:
+            tuple: recently played games and summary of the user
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            games_future = executor.submit(self.get_recently_played_games, steamid)
+            summary = executor.submit(self.get_player_summaries, steamid).result()
+            if on_avatar is not None and summary and summary["response"].get("players"):
+                executor.submit(self.load_avatar, summary).add_done_callback(
+                    lambda future: on_avatar(future.result())
+                )
+            if on_summary is not None:
+                on_summary(summary)
+            games = games_future.result()
+        return games, summary
+
+    def load_avatar(self, summaries: dict) -> Thumbnail:
+        """Download and shrink the avatar of an user.
 
         Args:
             summaries (dict): data containing the fetched information about user
 
         Returns:
-            str: username
+            Thumbnail: processed avatar, or None if the download failed
         """
-        self.username_list.append(summaries["response"]["players"][0]["personaname"])
+        avatar_url = summaries["response"]["players"][0]["avatar"]
+        return self.load_image(avatar_url, cache_key=parsing.get_avatar_key(avatar_url))
 
     def fetch_user_status(self, summaries: dict) -> str:
         """Filter, process and return user status.
@@ -118,20 +341,7 @@ class SteamAPI:
         Returns:
             str: status of user
         """
-        state = summaries["response"]["players"][0]["personastate"]
-        match state:
-            case 0:
-                return "Offline"
-            case 1:
-                return "Online"
-            case 2:
-                return "Busy"
-            case 3:
-                return "AFK"
-            case 4:
-                return "Snooze"
-            case _:
-                return ""
+        return parsing.parse_user_status(summaries)
 
     def fetch_last_logoff(self, summaries: dict) -> str:
         """Filter, process and return the time the user last logged off.
@@ -142,74 +352,83 @@ class SteamAPI:
         Returns:
             str: the time the user last logged off
         """
-        try:
-            last_logoff = summaries["response"]["players"][0]["lastlogoff"]
-        except KeyError as e:
-            print(f"[Warning] KeyError: {e}")
-            return "N/A"
+        return parsing.parse_last_logoff(summaries)
 
-        time = datetime.datetime.fromtimestamp(last_logoff)
-        time_formatted = time.strftime("%d.%m.%Y %H:%M")
-        return time_formatted
-
-    def fetch_icons(self, games: dict, iteration: int) -> None:
-        """Fetch, process and save the game icons.
+    def fetch_games(self, games: dict) -> GameTable:
+        """Filter and return the games of a response as a GameTable.
 
         Args:
             games (dict): data containing the fetched information about games
-            iteration (int): current iteration in loop over amount of games
+
+        Returns:
+            GameTable: the games of the response
         """
-        app_id = games["response"]["games"][iteration]["appid"]
-        icon_hash = games["response"]["games"][iteration]["img_icon_url"]
-        icon_url = (
-            f"http://media.steampowered.com/steamcommunity/"
-            f"public/images/apps/{app_id}/{icon_hash}.jpg"
-        )
-        try:
-            with urllib.request.urlopen(icon_url, timeout=10) as image_data:
-                image_file = io.BytesIO(image_data.read())
-            # Create and store ImageTk objects in the list
-            img = ImageTk.PhotoImage(Image.open(image_file))
-            self.image_list.append(img)
-        except (urllib.error.URLError, urllib.error.HTTPError) as e:
-            print("Error fetching icon:", e)
-            # Append a placeholder or handle the error accordingly
-            self.image_list.append(None)
+        return GameTable.from_response(games)
 
-    def fetch_names(self, games: dict, iteration: int):
-        """Fetch and save game titles.
+    def iter_icons(self, games: GameTable) -> Iterator[Thumbnail]:
+        """Fetch and shrink the icons of all games concurrently.
+
+        Downloading, decoding and resizing runs on a pool of at most max_workers threads,
+        icons are yielded in the order of the games as soon as they are ready.
 
         Args:
-            games (dict): data containing the fetched information about games
-            iteration (int): current iteration in loop over amount of games
+            games (GameTable): the games to fetch icons for
+
+        Yields:
+            Thumbnail: processed icon, or None if the download failed
         """
-        game_name = games["response"]["games"][iteration]["name"]
-        self.name_list.append(game_name)
+        icon_urls = [record.icon_url for record in games]
+        icon_keys = [record.icon_key for record in games]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from executor.map(self.load_image, icon_urls, icon_keys)
+
+    def load_image(self, image_url: str, cache_key: str = None) -> Thumbnail:
+        """Download an image and shrink it to the display size.
 
-    def fetch_playtime_2weeks(self, games: dict, iteration: int):
-        """Fetch and save the played time in last two weeks per game.
+        Concurrent loads of the same url, e.g. the icon of a popular game in
+        several profiles, wait for the first one and share its Thumbnail.
 
         Args:
-            games (dict): data containing the fetched information about games
-            iteration (int): current iteration in loop over amount of games
-        """
-        playtime_2weeks = (
-            f"{divmod(games['response']['games'][iteration]['playtime_2weeks'], 60)[0]:4}h "
-            f"{divmod(games['response']['games'][iteration]['playtime_2weeks'], 60)[1]:02}min"
-        )
+            image_url (str): url of the image
+            cache_key (str): content hash of the image used by the media cache
 
-        self.playtime_2weeks_list.append(playtime_2weeks)
+        Returns:
+            Thumbnail: processed image, or None if it couldn't be downloaded or decoded
+        """
+        try:
+            return self.media_fetches.do(
+                image_url, lambda: self._load_image(image_url, cache_key)
+            )
+        except requests.exceptions.RequestException as e:
+            print("Error fetching image:", e)
+            # Return a placeholder to handle the error accordingly
+            return None
+        except OSError as e:
+            # Not an image, e.g. an error page or a corrupt cache entry
+            print("Error decoding image:", e)
+            if self.media_cache is not None and cache_key:
+                self.media_cache.delete(cache_key)
+            return None
 
-    def fetch_playtime_forever(self, games: dict, iteration: int):
-        """Fetch and save the overall played time per game.
+    def _load_image(self, image_url: str, cache_key: str = None) -> Thumbnail:
+        """Read an image from the media cache or download it, then shrink it.
 
         Args:
-            games (dict): data containing the fetched information about games
-            iteration (int): current iteration in loop over amount of games
-        """
-        playtime_forever = (
-            f"{divmod(games['response']['games'][iteration]['playtime_forever'], 60)[0]:4}h "
-            f"{divmod(games['response']['games'][iteration]['playtime_forever'], 60)[1]:02}min"
-        )
+            image_url (str): url of the image
+            cache_key (str): content hash of the image used by the media cache
 
-        self.playtime_forever_list.append(playtime_forever)
+        Returns:
+            Thumbnail: processed image
+        """
+        data = None
+        with self.image_pipeline.timings.measure("fetch"), self.metrics.timer(
+            "media_fetch"
+        ):
+            if self.media_cache is not None and cache_key:
+                data = self.media_cache.get(cache_key)
+            if data is None:
+                data = self.transport.get_bytes(image_url)
+                if self.media_cache is not None and cache_key:
+                    self.media_cache.put(cache_key, data)
+        self.metrics.observe("media_bytes", len(data), buckets=SIZE_BUCKETS)
+        return self.image_pipeline.process(data)
@@ -0,0 +1,224 @@
+"""Shared HTTP transport keeping connections alive between requests."""
+
+import io
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from steam_web_api_client.core.rate_limiter import (
+    AdaptiveConcurrency,
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+)
+from steam_web_api_client.core.session_archive import SessionArchive
+
+
+class LimitedSession(requests.Session):
+    """Requests session throttling, retrying and limiting every request.
+
+    Requests to rate_limited_hosts take a token of the shared bucket first.
+    Throttled (429), failed (5xx) and broken requests are retried with
+    jittered exponential backoff and lower the allowed concurrency.
+
+    Attributes:
+        rate_limiter: A TokenBucket shared by all requests to rate_limited_hosts
+        rate_limited_hosts: A set of hosts counting against the api key quota
+        host_overrides: A dictionary mapping hosts to the base url serving them
+        retry_policy: A RetryPolicy deciding about retries
+        concurrency: An AdaptiveConcurrency limiting parallel requests
+    """
+
+    def __init__(
+        self,
+        rate_limiter: TokenBucket,
+        retry_policy: RetryPolicy,
+        concurrency: AdaptiveConcurrency,
+    ):
+        super().__init__()
+        self.rate_limiter = rate_limiter
+        self.rate_limited_hosts = {"api.steampowered.com"}
+        self.retry_policy = retry_policy
+        self.concurrency = concurrency
+        self.host_overrides = {}
+
+    def request(self, method, url, *args, **kwargs) -> requests.Response:
+        # pylint: disable=arguments-differ
+        """Send a request, retrying it according to the retry policy."""
+        parsed_url = urlparse(url)
+        rate_limited = parsed_url.netloc in self.rate_limited_hosts
+        if parsed_url.netloc in self.host_overrides:
+            url = (
+                self.host_overrides[parsed_url.netloc]
+                + url.split(parsed_url.netloc, 1)[1]
+            )
+        attempt = 0
+        while True:
+            if rate_limited:
+                self.rate_limiter.acquire()
+            error = None
+            response = None
+            with self.concurrency:
+                try:
+                    response = super().request(method, url, *args, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+
+            if error is None and not self.retry_policy.should_retry(
+                response.status_code
+            ):
+                self.concurrency.on_success()
+                return response
+
+            self.concurrency.on_error()
+            if attempt >= self.retry_policy.max_retries:
+                if error is not None:
+                    raise error
+                return response
+
+            retry_after = None
+            if response is not None:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None and rate_limited:
+                    self.rate_limiter.pause(retry_after)
+                response.close()
+            delay = self.retry_policy.get_delay(attempt, retry_after)
+            print(f"[WARNING] Retrying {urlparse(url).path} in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+class HTTPTransport:
+    """Send HTTP requests over a pool of keep-alive connections per host.
+
+    Attributes:
+        pool_size: An integer limiting the amount of pooled connections per host
+        timeout: A tuple holding the connect and read timeout in seconds
+        session: A LimitedSession used for all requests of the transport
+        archive: An optional SessionArchive recording or replaying all responses
+        latency_scale: A float scaling the recorded latencies when replaying,
+            1.0 replays them as recorded and 0.0 without any delay
+
+    Hosts can be served by another server with host_overrides, e.g.
+    {"api.steampowered.com": "http://127.0.0.1:8080"} for a local stub.
+
+    With an archive opened for writing every response is recorded, with one
+    opened for reading no request reaches the network.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: float = 5,
+        read_timeout: float = 10,
+        requests_per_second: float = 10,
+        retry_policy: RetryPolicy = None,
+        host_overrides: dict = None,
+        archive: SessionArchive = None,
+        latency_scale: float = 1.0,
+    ):
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = LimitedSession(
+            rate_limiter=TokenBucket(rate=requests_per_second),
+            retry_policy=retry_policy or RetryPolicy(),
+            concurrency=AdaptiveConcurrency(max_limit=pool_size),
+        )
+        self.session.host_overrides = dict(host_overrides or {})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.archive = archive
+        self.latency_scale = latency_scale
+
+    def get(self, url: str, params: dict = None) -> requests.Response:
+        """Send a GET request and raise an error for failed responses.
+
+        Args:
+            url (str): url of the resource
+            params (dict): query parameters of the request
+
+        Returns:
+            requests.Response: the response of the request
+        """
+        if self.archive is not None and self.archive.mode == "r":
+            response = self.replay(url, params)
+        else:
+            start = time.perf_counter()
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            if self.archive is not None:
+                self.archive.record(
+                    SessionArchive.make_key(url, params),
+                    response.status_code,
+                    response.content,
+                    time.perf_counter() - start,
+                )
+        response.raise_for_status()
+        return response
+
+    def replay(self, url: str, params: dict = None) -> requests.Response:
+        """Build the recorded response of a request.
+
+        Args:
+            url (str): url of the resource
+            params (dict): query parameters of the request
+
+        Returns:
+            requests.Response: the recorded response
+        """
+        key = SessionArchive.make_key(url, params)
+        archived = self.archive.lookup(key)
+        if archived is None:
+            raise requests.ConnectionError(f"{key} is not in {self.archive.path}")
+        if self.latency_scale:
+            time.sleep(archived.latency * self.latency_scale)
+        response = requests.Response()
+        response.status_code = archived.status
+        response.url = key
+        response.encoding = "utf-8"
+        response.raw = io.BytesIO(archived.body)
+        return response
+
+    def get_json(self, url: str, params: dict = None) -> dict:
+        """Send a GET request and decode the JSON response.
+
+        Args:
+            url (str): url of the resource
+            params (dict): query parameters of the request
+
+        Returns:
+            dict: the decoded response
+        """
+        return self.get(url, params=params).json()
+
+    def get_bytes(self, url: str) -> bytes:
+        """Download a resource.
+
+        Args:
+            url (str): url of the resource
+
+        Returns:
+            bytes: content of the resource
+        """
+        return self.get(url).content
+
+    @property
+    def reused_connections(self) -> int:
+        """Amount of requests that were sent over an already open connection."""
+        reused = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    reused += pool.num_requests - pool.num_connections
+        return reused
+
+    def close(self) -> None:
+        """Close all pooled connections and the archive."""
+        self.session.close()
+        if self.archive is not None:
+            self.archive.close()
@@ -0,0 +1,167 @@
+"""Resolve vanity names to steam IDs, cached in a SQLite database."""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from steam_web_api_client.core import parsing
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vanity_names (
+    name TEXT PRIMARY KEY,
+    steam_id TEXT,
+    resolved_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Names looked up in the cache per query, below the SQLite variable limit
+LOOKUP_BATCH_SIZE = 500
+
+
+class VanityResolver:
+    """Turn steam IDs, profile urls and vanity names into steam IDs.
+
+    ResolveVanityURL takes one name per call, so every name is resolved at
+    most once: the input is deduplicated, cached names are looked up in
+    batches and only the remaining ones are requested, concurrently.
+    Names without a user are cached too, for a shorter time.
+
+    Attributes:
+        steam_api: A SteamAPI used for the API calls
+        db_path: A string containing the path of the SQLite database
+        max_workers: An integer limiting the amount of concurrent API calls
+        ttl: A float holding the seconds a resolved name is kept
+        negative_ttl: A float holding the seconds an unknown name is kept
+    """
+
+    def __init__(
+        self,
+        steam_api,
+        db_path: str,
+        max_workers: int = 8,
+        ttl: float = 30 * 86400,
+        negative_ttl: float = 86400,
+    ):
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.steam_api = steam_api
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def resolve(self, identifier: str) -> str:
+        """Return the steam ID of a single identifier.
+
+        Args:
+            identifier (str): steam ID, profile url or vanity name
+
+        Returns:
+            str: steam ID, or None if it couldn't be resolved
+        """
+        return self.resolve_many([identifier])[0][1]
+
+    def resolve_many(self, identifiers: Iterable) -> list:
+        """Resolve many identifiers with as few API calls as possible.
+
+        Args:
+            identifiers (Iterable): steam IDs, profile urls and vanity names
+
+        Returns:
+            list: (identifier, steam ID or None) tuples in the input order
+        """
+        normalized = [
+            (identifier, parsing.normalize_identifier(identifier))
+            for identifier in identifiers
+        ]
+        names = {
+            parsed[1]
+            for _, parsed in normalized
+            if parsed is not None and parsed[0] == "vanity"
+        }
+        resolved = self._lookup(names)
+        missing = sorted(names - resolved.keys())
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                fetched = dict(zip(missing, executor.map(self._fetch, missing)))
+            # Failed calls return False and are tried again next time
+            fetched = {
+                name: steam_id
+                for name, steam_id in fetched.items()
+                if steam_id is not False
+            }
+            self._store(fetched)
+            resolved.update(fetched)
+
+        results = []
+        for identifier, parsed in normalized:
+            if parsed is None:
+                results.append((identifier, None))
+            elif parsed[0] == "steamid":
+                results.append((identifier, parsed[1]))
+            else:
+                results.append((identifier, resolved.get(parsed[1])))
+        return results
+
+    def _lookup(self, names: set) -> dict:
+        """Read cached names which haven't expired.
+
+        Args:
+            names (set): vanity names
+
+        Returns:
+            dict: steam ID or None per cached name
+        """
+        now = time.time()
+        names = list(names)
+        cached = {}
+        with self._lock:
+            for start in range(0, len(names), LOOKUP_BATCH_SIZE):
+                batch = names[start : start + LOOKUP_BATCH_SIZE]
+                rows = self._connection.execute(
+                    "SELECT name, steam_id, resolved_at FROM vanity_names "
+                    f"WHERE name IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+                for name, steam_id, resolved_at in rows:
+                    ttl = self.ttl if steam_id is not None else self.negative_ttl
+                    if resolved_at + ttl > now:
+                        cached[name] = steam_id
+        return cached
+
+    def _fetch(self, name: str):
+        """Resolve a name through the API.
+
+        Args:
+            name (str): vanity name
+
+        Returns:
+            steam ID, None if no user has the name or False if the call failed
+        """
+        resolved = self.steam_api.resolve_vanity_url(name)
+        if not resolved or "response" not in resolved:
+            return False
+        return parsing.parse_vanity_url(resolved)
+
+    def _store(self, resolved: dict) -> None:
+        """Cache resolved names.
+
+        Args:
+            resolved (dict): steam ID or None per name
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO vanity_names (name, steam_id, resolved_at) "
+                "VALUES (?, ?, ?)",
+                ((name, steam_id, now) for name, steam_id in resolved.items()),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
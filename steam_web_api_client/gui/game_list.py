@@ -0,0 +1,244 @@
+"""Scrollable list of games creating widgets only for the visible rows"""
+
+import math
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable
+
+COLUMN_WIDTHS = (48, 300, 140, 140)
+
+
+class GameList:
+    # pylint: disable=too-many-instance-attributes
+    """Show game rows in a virtualized list.
+
+    Only enough row widgets to fill the visible area are created. While
+    scrolling the same widgets are moved and filled with other rows, so the
+    amount of widgets stays constant however many games are added. Icons
+    are kept as Thumbnails, every pooled row owns one tkinter image which
+    is refilled with the icon of the row it shows.
+
+    Attributes:
+        frame = A frame holding the canvas and the scrollbar
+        canvas = The area the visible rows are placed onto
+        scrollbar = The vertical scrollbar of the list
+        rows = A list holding Thumbnail, title and playtimes of every game
+        to_photo_image = A callable creating a tkinter image from a Thumbnail
+        row_height = An integer holding the height of a row in pixels
+        max_visible_rows = An integer limiting the height of the list in rows
+        offset = An integer holding the scrolled distance in pixels
+        placeholder = The canvas item of the shown message, or None
+    """
+
+    def __init__(
+        self,
+        master,
+        to_photo_image: Callable,
+        row_height: int = 42,
+        max_visible_rows: int = 10,
+    ):
+        self.frame = tk.Frame(master, background="white")
+        self.scrollbar = ttk.Scrollbar(
+            self.frame, orient="vertical", command=self.yview
+        )
+        self.canvas = tk.Canvas(
+            self.frame,
+            width=sum(COLUMN_WIDTHS),
+            height=row_height,
+            background="white",
+            highlightthickness=0,
+        )
+        self.rows = []
+        self.to_photo_image = to_photo_image
+        self.row_height = row_height
+        self.max_visible_rows = max_visible_rows
+        self.offset = 0
+        self.pool = []
+        self.placeholder = None
+
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda event: self.refresh())
+        self.canvas.bind_all(
+            "<MouseWheel>",
+            lambda event: self.yview("scroll", int(-1 * (event.delta / 120)), "units"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def append(self, icon, title: str, playtime_2weeks: str, playtime_forever: str):
+        """Add a game row at the end of the list.
+
+        Args:
+            icon (Thumbnail): icon of the game, or None
+            title (str): title of the game
+            playtime_2weeks (str): formatted playtime in the last 2 weeks
+            playtime_forever (str): formatted overall playtime
+        """
+        if self.placeholder is not None:
+            self.canvas.delete(self.placeholder)
+            self.placeholder = None
+        self.rows.append((icon, title, playtime_2weeks, playtime_forever))
+        visible_rows = min(len(self.rows), self.max_visible_rows)
+        if int(self.canvas.cget("height")) != visible_rows * self.row_height:
+            self.canvas.config(height=visible_rows * self.row_height)
+        self.refresh()
+
+    def update_row(
+        self, index: int, icon, title: str, playtime_2weeks: str, playtime_forever: str
+    ):
+        """Change the values of a game row, reconfiguring only changed labels.
+
+        Args:
+            index (int): position of the row
+            icon (Thumbnail): icon of the game, or None
+            title (str): title of the game
+            playtime_2weeks (str): formatted playtime in the last 2 weeks
+            playtime_forever (str): formatted overall playtime
+        """
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        previous = self.rows[index]
+        values = (icon, title, playtime_2weeks, playtime_forever)
+        self.rows[index] = values
+        for row in self.pool:
+            if row["index"] != index:
+                continue
+            labels = row["labels"]
+            if icon is not previous[0]:
+                self.show_icon(row, icon)
+            for label, old, new in zip(labels[1:], previous[1:], values[1:]):
+                if old != new:
+                    label.config(text=new)
+
+    def remove(self, index: int) -> None:
+        """Remove a game row, the pooled widgets are kept and refilled.
+
+        Args:
+            index (int): position of the row
+        """
+        del self.rows[index]
+        for row in self.pool:
+            if row["index"] is not None and row["index"] >= index:
+                row["index"] = None
+        visible_rows = max(1, min(len(self.rows), self.max_visible_rows))
+        if int(self.canvas.cget("height")) != visible_rows * self.row_height:
+            self.canvas.config(height=visible_rows * self.row_height)
+        self.refresh()
+
+    def show_placeholder(self, text: str) -> None:
+        """Show a message instead of game rows.
+
+        Args:
+            text (str): message to show
+        """
+        self.canvas.config(height=self.row_height * 1.5)
+        self.placeholder = self.canvas.create_text(
+            sum(COLUMN_WIDTHS) // 2,
+            self.row_height * 0.75,
+            text=text,
+            font=("Helvetica", 11),
+        )
+
+    def yview(self, *args) -> None:
+        """Scroll the list, called by the scrollbar and the mouse wheel.
+
+        Args:
+            args: either ("moveto", fraction) or ("scroll", amount, "units"|"pages")
+        """
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.rows) * self.row_height)
+        elif args[0] == "scroll":
+            step = self.row_height if args[2] == "units" else self.view_height()
+            self.offset += int(args[1]) * step
+        self.refresh()
+
+    def view_height(self) -> int:
+        """Height of the visible area in pixels."""
+        return max(self.canvas.winfo_height(), int(self.canvas.cget("height")))
+
+    def refresh(self) -> None:
+        """Place the pooled row widgets onto the visible rows."""
+        view_height = self.view_height()
+        total_height = len(self.rows) * self.row_height
+        self.offset = max(0, min(self.offset, total_height - view_height))
+
+        # Grow the pool until it covers the visible area
+        while len(self.pool) < math.ceil(view_height / self.row_height) + 1:
+            self.pool.append(self.create_row())
+
+        first_index = self.offset // self.row_height
+        for slot, row in enumerate(self.pool):
+            index = first_index + slot
+            if index >= len(self.rows):
+                self.canvas.itemconfigure(row["item"], state="hidden")
+                continue
+            if row["index"] != index:
+                row["index"] = index
+                self.fill_row(row, self.rows[index])
+            self.canvas.coords(row["item"], 0, index * self.row_height - self.offset)
+            self.canvas.itemconfigure(row["item"], state="normal")
+
+        if total_height > 0:
+            self.scrollbar.set(
+                self.offset / total_height,
+                min((self.offset + view_height) / total_height, 1.0),
+            )
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def create_row(self) -> dict:
+        """Create the widgets of one pooled row.
+
+        Returns:
+            dict: canvas item, labels and currently shown index of the row
+        """
+        row_frame = tk.Frame(
+            self.canvas,
+            width=sum(COLUMN_WIDTHS),
+            height=self.row_height,
+            background="white",
+        )
+        row_frame.grid_propagate(False)
+        row_frame.grid_rowconfigure(0, weight=1)
+        for column, width in enumerate(COLUMN_WIDTHS):
+            row_frame.grid_columnconfigure(column, minsize=width)
+        labels = [tk.Label(row_frame, background="white") for _ in COLUMN_WIDTHS]
+        labels[0].grid(row=0, column=0, padx=5)
+        labels[1].grid(row=0, column=1, padx=(5, 30), sticky="W")
+        labels[2].grid(row=0, column=2, padx=(0, 20), sticky="E")
+        labels[3].grid(row=0, column=3, padx=(0, 20), sticky="E")
+        item = self.canvas.create_window(
+            0, 0, window=row_frame, anchor="nw", state="hidden"
+        )
+        return {"item": item, "labels": labels, "index": None, "photo": None}
+
+    def fill_row(self, row: dict, values: tuple) -> None:
+        """Show the values of a game in a pooled row.
+
+        Args:
+            row (dict): the pooled row
+            values (tuple): icon, title and playtimes of the game
+        """
+        icon, title, playtime_2weeks, playtime_forever = values
+        labels = row["labels"]
+        self.show_icon(row, icon)
+        labels[1].config(text=title)
+        labels[2].config(text=playtime_2weeks)
+        labels[3].config(text=playtime_forever)
+
+    def show_icon(self, row: dict, icon) -> None:
+        """Show an icon in a pooled row, reusing the tkinter image of the row.
+
+        Args:
+            row (dict): the pooled row
+            icon (Thumbnail): icon of the game, or None
+        """
+        if icon is None:
+            row["labels"][0].config(image="")
+            return
+        if row["photo"] is None:
+            row["photo"] = self.to_photo_image(icon)
+        else:
+            row["photo"].configure(data=icon.data, format="PPM")
+        row["labels"][0].config(image=row["photo"])
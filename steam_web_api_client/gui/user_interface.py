@@ -1,22 +1,38 @@
 """Setup general window of client"""
 
 import os
+import queue
+import threading
 import tkinter as tk
 import webbrowser
 from tkinter import ttk
 
+from steam_web_api_client.core import parsing
 from steam_web_api_client.core.data_handler import DataHandler
+from steam_web_api_client.core.game_table import GameTable
+from steam_web_api_client.core.media_cache import MediaCache
+from steam_web_api_client.core.response_cache import ResponseCache
 from steam_web_api_client.core.steam_api import SteamAPI
+from steam_web_api_client.core.vanity_resolver import VanityResolver
+from steam_web_api_client.gui.game_list import COLUMN_WIDTHS, GameList
+
+# Seconds between two polls of the watch mode
+WATCH_INTERVAL = 60
 
 
 class UserInterface:
+    # pylint: disable=too-many-instance-attributes
     """Create and manage the main user interface.
 
     Attributes:
         root = Tkinter root window
         api_key = A tkinter string holding the value of the steam api key
-        steam_id = A tkinter string holding the value of the steam_id of an user
+        steam_id = A tkinter string holding the steam ID, profile url or vanity name
         data_path = A string containing the path of the data.json file
+        vanity_path = A string containing the path of the vanity name cache
+        media_cache = A MediaCache storing downloaded icons and avatars on disk
+        response_cache = A ResponseCache shared by all response windows
+        steam_apis = A dictionary holding one SteamAPI per api key
         icon_path = A string containing the path of the window icon
     """
 
@@ -29,6 +45,14 @@ class UserInterface:
         self.api_key.trace_add("write", lambda *args: self.limit_entry())
         self.steam_id.trace_add("write", lambda *args: self.limit_entry())
         self.data_path = os.path.join("steam_web_api_client", "data", "data.json")
+        self.vanity_path = os.path.join("steam_web_api_client", "data", "vanity.db")
+        self.media_cache = MediaCache(
+            cache_dir=os.path.join("steam_web_api_client", "data", "media")
+        )
+        self.response_cache = ResponseCache(
+            store_path=os.path.join("steam_web_api_client", "data", "responses")
+        )
+        self.steam_apis = {}
         icon_path = os.path.join("steam_web_api_client", "assets", "icon.png")
         self.current_id = tk.StringVar()
         self.current_user = tk.StringVar()
@@ -41,7 +65,7 @@ class UserInterface:
         tk.Grid.columnconfigure(self.root, 1, weight=1)
         self.root.iconphoto(True, tk.PhotoImage(file=icon_path))
 
-        # Read from data\data.json
+        # Read from data\data.db, importing an existing data\data.json
         self.data_handler = DataHandler(data_path=self.data_path)
         api_key = self.data_handler.read_data()
         self.api_key.set(api_key)
@@ -55,7 +79,7 @@ class UserInterface:
         )
         label2 = tk.Label(
             self.root,
-            text="Steam ID",
+            text="Steam ID or Profile URL",
             background="white",
             font=("Helvetica", 9, "bold"),
         )
@@ -110,13 +134,13 @@ class UserInterface:
         )
 
     def limit_entry(self):
-        """Limit maximum characters in entries."""
+        """Limit maximum characters in the api key entry.
+
+        The steam ID entry isn't limited, it also takes profile urls.
+        """
         api_value = self.api_key.get()
-        id_value = self.steam_id.get()
         if len(api_value) > 32:
             self.api_key.set(api_value[:32])
-        if len(id_value) > 17:
-            self.steam_id.set(id_value[:17])
 
     def open_browser(self, url: str) -> None:
         """Opens a new tab in browser and follows link.
@@ -134,127 +158,311 @@ class UserInterface:
                 self.data_handler.get_username_by_id(self.current_id.get())
             )
 
+    def get_steam_api(self, api_key: str) -> SteamAPI:
+        """Return the client of an api key, created on first use.
+
+        Args:
+            api_key (str): value of the steam api key
+
+        Returns:
+            SteamAPI: the client shared by all response windows of the api key
+        """
+        if api_key not in self.steam_apis:
+            self.steam_apis[api_key] = SteamAPI(
+                api_key=api_key,
+                media_cache=self.media_cache,
+                response_cache=self.response_cache,
+            )
+        return self.steam_apis[api_key]
+
     def open_response_window(self) -> None:
         """Opens a window containing the response of the API."""
+        steam_api = self.get_steam_api(self.api_key.get())
         ResponseWindow(
             self.root,
             api_key=self.api_key,
             steam_id=self.steam_id,
             data_handler=self.data_handler,
+            steam_api=steam_api,
+            resolver=VanityResolver(steam_api, self.vanity_path),
         )
 
 
 class ResponseWindow:
+    # pylint: disable=too-many-instance-attributes
     """Create and manage the response window showing Steam API information.
 
+    All network I/O runs on a background thread which hands its results to the
+    Tk thread through a queue polled with after(). In watch mode the thread
+    keeps polling summary and recently played games and only queues the
+    differences to the previous response.
+
     Attributes:
         root = root window
         api_key = A tkinter string holding the value of the steam api key
-        steam_id = A tkinter string holding the value of the steam_id of an user
+        steam_id = A tkinter string holding the steam ID, profile url or vanity name
         data_handler = An existing object of the DataHandler class
+        steam_api = An existing object of the SteamAPI class
+        resolver = A VanityResolver turning the entered steam_id into a steam ID
         response = A new toplevel window for response information
+        avatar = The tkinter image of the shown avatar
+        results = A queue holding results of the background thread
+        watch_enabled = A tkinter boolean holding the state of the watch toggle
+        watching = An event set while the watch mode is enabled
+        closed = An event set when the window is closed
     """
 
     def __init__(
-        self, root, api_key: tk.StringVar, steam_id: tk.StringVar, data_handler
+        self,
+        root,
+        api_key: tk.StringVar,
+        steam_id: tk.StringVar,
+        data_handler,
+        steam_api: SteamAPI,
+        resolver: VanityResolver,
     ):
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
         # Initialize response window and variables
         self.root = root
         self.api_key = api_key
         self.steam_id = steam_id
+        self.data_handler = data_handler
         self.response = tk.Toplevel(self.root)
         self.response.title("Steam Web API")
         self.response.resizable(False, False)
-        self.steam_api = SteamAPI(api_key=self.api_key.get())
-        self.row_end = 0
+        self.steam_api = steam_api
+        self.resolver = resolver
+        self.avatar = None
+        self.results = queue.Queue()
+        self.watching = threading.Event()
+        self.closed = threading.Event()
+        self.games = None
         self.total_time_2weeks = 0
 
-        # Create a canvas with the vertical scrollbar
-        scrollbar = ttk.Scrollbar(self.response, orient="vertical")
-        canvas = tk.Canvas(
-            self.response, yscrollcommand=scrollbar.set, background="white"
+        # Header showing user information
+        self.frame = tk.Frame(self.response, background="white")
+        self.create_static_widgets(frame=self.frame)
+
+        # Virtualized list showing game information
+        self.game_list = GameList(
+            self.response, to_photo_image=self.steam_api.image_pipeline.to_photo_image
+        )
+
+        # Footer showing the total played time in 2 weeks
+        footer = tk.Frame(self.response, background="white")
+        separator4 = ttk.Separator(footer, orient="horizontal")
+        self.total_label = tk.Label(
+            footer,
+            text=parsing.format_playtime(self.total_time_2weeks),
+            font=("Helvetica", 9, "bold"),
+            background="white",
         )
+        for column, width in enumerate(COLUMN_WIDTHS):
+            footer.grid_columnconfigure(column, minsize=width)
+        self.watch_enabled = tk.BooleanVar(footer, value=False)
+        watch_toggle = ttk.Checkbutton(
+            footer,
+            text="Watch",
+            variable=self.watch_enabled,
+            command=self.toggle_watch,
+        )
+        separator4.grid(row=0, column=0, columnspan=4, sticky="WE")
+        watch_toggle.grid(row=1, column=1, padx=5, pady=15, sticky="W")
+        self.total_label.grid(row=1, column=2, padx=(0, 20), pady=15, sticky="E")
+
+        self.frame.pack(side="top", fill="x")
+        self.game_list.frame.pack(side="top", fill="both", expand=True)
+        footer.pack(side="top", fill="x")
 
-        # Create a frame inside the canvas to hold the widgets
-        frame = tk.Frame(canvas, background="white")
+        # When the response window is closed, destroy the main window
+        self.response.protocol("WM_DELETE_WINDOW", self.on_response_close)
 
         # Steam Web API
-        games = self.steam_api.get_recently_played_games(steamid=self.steam_id.get())
-        summary = self.steam_api.get_player_summaries(steamid=steam_id.get())
+        threading.Thread(
+            target=self.fetch_data, args=(self.steam_id.get(),), daemon=True
+        ).start()
+        self.response.after(50, self.process_results)
 
-        # Error Handling
-        if not games["response"] or not summary["response"]:
-            self.root.destroy()
-            print("[INFO] Response Window has been closed!")
-            user_interface = UserInterface()
-            user_interface.root.mainloop()
+    def fetch_data(self, identifier: str) -> None:
+        """Fetch all information on a background thread and queue the results.
+
+        Args:
+            identifier (str): steam ID, profile url or vanity name of the user
+        """
+        steamid = self.resolver.resolve(identifier)
+        if steamid is None:
+            print(f"[WARNING] Couldn't resolve {identifier}")
+            self.results.put(("summary", None))
             return
+        games, summary = self.steam_api.get_profile(
+            steamid=steamid,
+            on_summary=lambda summary: self.results.put(("summary", summary)),
+            on_avatar=lambda avatar: self.results.put(("avatar", avatar)),
+        )
+        if not games or not games["response"]:
+            self.results.put(("games", None))
+            return
+        table = self.steam_api.fetch_games(games)
+        self.results.put(("games", table))
+        for index, icon in enumerate(self.steam_api.iter_icons(table)):
+            self.results.put(("row", (index, icon)))
+        if summary and summary["response"].get("players"):
+            self.watch(steamid, summary, table)
 
-        # Data Handler
-        data_handler.api_key = self.api_key.get()
-        self.steam_api.fetch_username(summaries=summary)
-        data_handler.username_list.append(self.steam_api.username_list[0])
-        if self.steam_id.get() not in data_handler.id_list:
-            if len(data_handler.id_list) >= 10:
-                data_handler.id_list[-1] = self.steam_id.get()
-            else:
-                data_handler.id_list.append(self.steam_id.get())
+    def watch(self, steamid: str, summary: dict, table: GameTable) -> None:
+        """Poll summary and games while watching and queue only the differences.
 
-            data_handler.save_data()
+        Icons are only downloaded for added games and changed icon hashes.
 
-        amount_games = games["response"]["total_count"]
+        Args:
+            steamid (str): steam ID of user to fetch information
+            summary (dict): the summary shown in the window
+            table (GameTable): the games shown in the window
+        """
+        avatar_url = summary["response"]["players"][0]["avatar"]
+        while not self.closed.wait(WATCH_INTERVAL):
+            if not self.watching.is_set():
+                continue
+            summary = self.steam_api.get_player_summaries(steamid, refresh=True)
+            if summary and summary["response"].get("players"):
+                self.results.put(("status", summary))
+                if summary["response"]["players"][0]["avatar"] != avatar_url:
+                    avatar_url = summary["response"]["players"][0]["avatar"]
+                    self.results.put(("avatar", self.steam_api.load_avatar(summary)))
+
+            games = self.steam_api.get_recently_played_games(steamid, refresh=True)
+            if not games or not games["response"]:
+                continue
+            changed, added, removed = table.diff(GameTable.from_response(games))
+            if not (changed or added or removed):
+                continue
+            new_icons = GameTable(
+                [
+                    record
+                    for index, record in changed
+                    if record.icon_hash != table[index].icon_hash
+                ]
+                + added
+            )
+            icons = {
+                record.appid: icon
+                for record, icon in zip(new_icons, self.steam_api.iter_icons(new_icons))
+            }
+            table = table.patch(changed, added, removed)
+            self.results.put(("changes", (changed, added, removed, icons)))
+
+    def process_results(self) -> None:
+        """Apply queued results of the background thread to the widgets."""
+        handlers = {
+            "summary": self.show_summary,
+            "avatar": self.show_avatar,
+            "games": self.show_games,
+            "row": lambda row: self.add_game_row(*row),
+            "status": self.update_summary,
+            "changes": lambda changes: self.apply_changes(*changes),
+        }
+        if self.closed.is_set():
+            return
+        try:
+            while True:
+                kind, value = self.results.get_nowait()
+                if handlers[kind](value) is False:
+                    return
+        except queue.Empty:
+            pass
+        self.response.after(50, self.process_results)
+
+    def show_summary(self, summary: dict) -> bool:
+        """Fill the header with user information and save the steam ID.
 
-        # Create and place static widgets
-        self.create_static_widgets(summary=summary, frame=frame)
+        Args:
+            summary (dict): data containing the fetched information about user
 
-        # Create and place dynamic widgets
-        self.total_time_2weeks = self.create_dynamic_widgets(
-            amount_games=amount_games, games=games, frame=frame
-        )
+        Returns:
+            bool: False if the summary couldn't be fetched
+        """
+        # Error Handling
+        if not summary or not summary["response"].get("players"):
+            self.close_with_error()
+            return False
 
-        separator4 = ttk.Separator(frame, orient="horizontal")
-        separator4.grid(row=self.row_end, column=0, columnspan=4, sticky="WE")
+        # Data Handler, the entered profile url or name becomes the steam ID
+        self.data_handler.save_api_key(self.api_key.get())
+        username = parsing.parse_username(summary)
+        self.steam_id.set(parsing.parse_steamid(summary))
+        self.data_handler.save_profile(self.steam_id.get(), username)
 
-        str_total_time_2weeks = (
-            f"{divmod(self.total_time_2weeks, 60)[0]:4}h "
-            f"{divmod(self.total_time_2weeks, 60)[1]:02}min"
-        )
+        # User Information
+        user_status_value = self.steam_api.fetch_user_status(summaries=summary)
+        last_logoff_value = self.steam_api.fetch_last_logoff(summaries=summary)
+        if user_status_value == "Online":
+            last_logoff_value = "Now"
+        self.username.config(text=username)
+        self.status.config(text=user_status_value)
+        self.last_logoff.config(text=last_logoff_value)
+        return True
 
-        label4 = tk.Label(
-            frame,
-            text=str_total_time_2weeks,
-            font=("Helvetica", 9, "bold"),
-            background="white",
-        )
-        label4.grid(row=self.row_end + 1, column=2, padx=45, pady=15, sticky="E")
+    def update_summary(self, summary: dict) -> None:
+        """Update the labels of the header whose values changed.
 
-        # Configure canvas
-        self.config_canvas(canvas=canvas, scrollbar=scrollbar, frame=frame)
+        Args:
+            summary (dict): data containing the fetched information about user
+        """
+        username = parsing.parse_username(summary)
+        user_status_value = parsing.parse_user_status(summary)
+        last_logoff_value = parsing.parse_last_logoff(summary)
+        if user_status_value == "Online":
+            last_logoff_value = "Now"
+        if update_text(self.username, username):
+            self.data_handler.save_profile(self.steam_id.get(), username)
+        update_text(self.status, user_status_value)
+        update_text(self.last_logoff, last_logoff_value)
 
-        # Automatically adjust the window size based on the content
-        self.response.update_idletasks()
-        self.response.geometry(
-            f"{frame.winfo_reqwidth()}x{min(frame.winfo_reqheight(), 500)}"
-        )
+    def show_avatar(self, avatar) -> None:
+        """Show the avatar of the user in the header.
 
-        # When the response window is closed, destroy the main window
-        self.response.protocol("WM_DELETE_WINDOW", self.on_response_close)
+        Args:
+            avatar (Thumbnail): processed avatar, or None if the download failed
+        """
+        if avatar is not None:
+            self.avatar = self.steam_api.image_pipeline.to_photo_image(avatar)
+            self.avatar_head.config(image=self.avatar)
 
-    def create_static_widgets(self, summary: dict, frame: ttk.Frame) -> None:
-        # pylint: disable=too-many-locals
+    def show_games(self, games: GameTable) -> bool:
+        """Prepare the game list for the incoming rows.
+
+        Args:
+            games (GameTable): the fetched games, or None if they couldn't be fetched
+
+        Returns:
+            bool: False if the games couldn't be fetched
+        """
+        # Error Handling
+        if games is None:
+            self.close_with_error()
+            return False
+
+        self.games = games
+        if len(games) == 0:
+            self.game_list.show_placeholder("No Games Found")
+        return True
+
+    def close_with_error(self) -> None:
+        """Close the response window and reopen the main user interface."""
+        self.close_caches()
+        self.root.destroy()
+        print("[INFO] Response Window has been closed!")
+        user_interface = UserInterface()
+        user_interface.root.mainloop()
+
+    def create_static_widgets(self, frame: ttk.Frame) -> None:
         """Create widgets showing user information.
 
+        The widgets are filled as soon as the user information arrives.
+
         Args:
-            summary (dict): data containing the fetched information about user
             frame (ttk.Frame): the area to place widgets onto
         """
-        # User Information
-        self.steam_api.fetch_avatar(summaries=summary)
-        user_status_value = self.steam_api.fetch_user_status(summaries=summary)
-        last_logoff_value = self.steam_api.fetch_last_logoff(summaries=summary)
-        if user_status_value == "Online":
-            last_logoff_value = "Now"
-
         # Static Widgets
         status_head = tk.Label(
             frame, text="Status", font=("Helvetica", 9, "bold"), background="white"
@@ -266,14 +474,10 @@ class ResponseWindow:
             background="white",
         )
         separator1 = ttk.Separator(frame, orient="horizontal")
-        avatar_head = tk.Label(
-            frame, image=self.steam_api.avatar_list[0], background="white"
-        )
-        username = tk.Label(
-            frame, text=self.steam_api.username_list[0], background="white"
-        )
-        status = tk.Label(frame, text=user_status_value, background="white")
-        last_logoff = tk.Label(frame, text=last_logoff_value, background="white")
+        self.avatar_head = tk.Label(frame, background="white")
+        self.username = tk.Label(frame, text="Loading...", background="white")
+        self.status = tk.Label(frame, background="white")
+        self.last_logoff = tk.Label(frame, background="white")
         separator2 = ttk.Separator(frame, orient="horizontal")
         playtime_2weeks_head = tk.Label(
             frame,
@@ -285,116 +489,105 @@ class ResponseWindow:
             frame, text="Overall", font=("Helvetica", 9, "bold"), background="white"
         )
         separator3 = ttk.Separator(frame, orient="horizontal")
+        for column, width in enumerate(COLUMN_WIDTHS):
+            frame.grid_columnconfigure(column, minsize=width)
 
         # Grid Placement
         status_head.grid(row=0, column=2, padx=5, pady=5)
         separator1.grid(row=1, column=0, columnspan=4, sticky="WE")
-        avatar_head.grid(row=2, column=0, padx=5, pady=10)
+        self.avatar_head.grid(row=2, column=0, padx=5, pady=10)
         last_logoff_head.grid(row=0, column=3, padx=25, pady=5)
-        username.grid(row=2, column=1, padx=5, pady=10, sticky="W")
-        status.grid(row=2, column=2, padx=5, pady=10)
-        last_logoff.grid(row=2, column=3, padx=5, pady=10)
+        self.username.grid(row=2, column=1, padx=5, pady=10, sticky="W")
+        self.status.grid(row=2, column=2, padx=5, pady=10)
+        self.last_logoff.grid(row=2, column=3, padx=5, pady=10)
         separator2.grid(row=3, column=0, columnspan=4, sticky="WE")
-        playtime_2weeks_head.grid(row=4, column=2, padx=25, sticky="WE")
-        playtime_forever_head.grid(row=4, column=3, padx=25, sticky="WE")
+        playtime_2weeks_head.grid(row=4, column=2, padx=(0, 20), sticky="E")
+        playtime_forever_head.grid(row=4, column=3, padx=(0, 20), sticky="E")
         separator3.grid(row=5, column=0, columnspan=4, sticky="WE")
 
-    def create_dynamic_widgets(
-        self, amount_games: int, games: dict, frame: ttk.Frame
-    ) -> int:
-        """Create widgets showing game information.
+    def add_game_row(self, index: int, icon) -> None:
+        """Append the information of one game to the game list.
 
         Args:
-            amount_games (int): amount of games returned from API
-            games (dict): data containing the fetched information about games
-            frame (ttk.Frame): the area to place widgets onto
-
-        Returns:
-            int: total played time in 2 weeks
+            index (int): position of the game in the game table
+            icon (Thumbnail): processed icon, or None if the download failed
         """
+        record = self.games[index]
+        self.total_time_2weeks += record.playtime_2weeks
+        self.game_list.append(
+            icon=icon,
+            title=record.name,
+            playtime_2weeks=record.playtime_2weeks_text,
+            playtime_forever=record.playtime_forever_text,
+        )
+        self.total_label.config(text=parsing.format_playtime(self.total_time_2weeks))
 
-        total_time_2weeks = 0
-
-        if amount_games > 0:
-            for i in range(amount_games):
-                # Playtime Information
-                self.steam_api.fetch_icons(games=games, iteration=i)
-                self.steam_api.fetch_names(games=games, iteration=i)
-                self.steam_api.fetch_playtime_2weeks(games=games, iteration=i)
-                self.steam_api.fetch_playtime_forever(games=games, iteration=i)
-
-                total_time_2weeks += games["response"]["games"][i]["playtime_2weeks"]
-
-                # Dynamic Widgets
-                icon = tk.Label(
-                    frame, image=self.steam_api.image_list[i], background="white"
-                )
-                title = tk.Label(
-                    frame, text=self.steam_api.name_list[i], background="white"
-                )
-                playtime_2weeks = tk.Label(
-                    frame,
-                    text=self.steam_api.playtime_2weeks_list[i],
-                    background="white",
-                )
-                playtime_forever = tk.Label(
-                    frame,
-                    text=self.steam_api.playtime_forever_list[i],
-                    background="white",
-                )
-
-                # Grid Placement
-                row_begin = i + 6
-                icon.grid(row=row_begin, column=0, padx=5, pady=5)
-                title.grid(row=row_begin, column=1, padx=(5, 30), pady=5, sticky="W")
-                playtime_2weeks.grid(
-                    row=row_begin, column=2, padx=45, pady=5, sticky="E"
-                )
-                playtime_forever.grid(
-                    row=row_begin, column=3, padx=45, pady=5, sticky="E"
-                )
-
-                self.row_end = row_begin + 1
-        else:
-            placeholder_label = tk.Label(
-                frame,
-                text="No Games Found",
-                background="white",
-                font=("Helvetica", 11),
-            )
-            placeholder_label.grid(row=6, column=0, columnspan=4, padx=5, pady=20)
-            self.row_end = 7
-
-        return total_time_2weeks
-
-    def config_canvas(
-        self, canvas: tk.Canvas, scrollbar: tk.Scrollbar, frame: tk.Frame
+    def apply_changes(
+        self, changed: list, added: list, removed: list, icons: dict
     ) -> None:
-        """Adjust canvas options based on content.
+        """Update, remove and append only the game rows that changed.
 
         Args:
-            canvas (tk.Canvas): the area where the content frame is in
+            changed (list): (index, record) tuples of changed games
+            added (list): records of games to append
+            removed (list): indexes of games to remove in ascending order
+            icons (dict): processed icons of added games and changed icons by app ID
         """
-        scrollbar.pack(side="right", fill="y")
-        scrollbar.config(command=canvas.yview)
-        canvas.config(yscrollcommand=scrollbar.set)
-        canvas.pack(side="left", fill="both", expand=True, padx=(0, 0), pady=(0, 0))
-
-        canvas.create_window((0, 0), window=frame, anchor="nw")
-
-        # Update the scroll region whenever the canvas is updated
-        canvas.update_idletasks()
-        canvas.config(scrollregion=canvas.bbox("all"))
-
-        # Bind the canvas scrolling to the scrollbar
-        # Automatically adjust the canvas width based on the content
-        canvas.bind("<Configure>", lambda e: canvas.config(width=canvas.winfo_width()))
-        canvas.bind_all(
-            "<MouseWheel>",
-            lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"),
-        )
+        for index, record in changed:
+            self.game_list.update_row(
+                index,
+                icon=icons.get(record.appid, self.game_list.rows[index][0]),
+                title=record.name,
+                playtime_2weeks=record.playtime_2weeks_text,
+                playtime_forever=record.playtime_forever_text,
+            )
+        for index in reversed(removed):
+            self.game_list.remove(index)
+        for record in added:
+            self.game_list.append(
+                icon=icons.get(record.appid),
+                title=record.name,
+                playtime_2weeks=record.playtime_2weeks_text,
+                playtime_forever=record.playtime_forever_text,
+            )
+        self.games = self.games.patch(changed, added, removed)
+        self.total_time_2weeks = self.games.total_playtime_2weeks
+        update_text(self.total_label, parsing.format_playtime(self.total_time_2weeks))
+
+    def toggle_watch(self) -> None:
+        """Start or pause polling for changes."""
+        if self.watch_enabled.get():
+            self.watching.set()
+        else:
+            self.watching.clear()
 
     def on_response_close(self) -> None:
         """When closing the response window also close root window."""
+        self.close_caches()
         if self.root.winfo_exists():
             self.root.destroy()
+
+    def close_caches(self) -> None:
+        """Stop watching, write and close the caches and the database."""
+        self.closed.set()
+        self.resolver.close()
+        print(f"[INFO] Image pipeline: {self.steam_api.image_pipeline.timings}")
+        if self.steam_api.response_cache is not None:
+            self.steam_api.response_cache.close()
+        self.data_handler.close()
+
+
+def update_text(label: tk.Label, text: str) -> bool:
+    """Change the text of a label only if it differs.
+
+    Args:
+        label (tk.Label): the label to update
+        text (str): the new text
+
+    Returns:
+        bool: True if the text changed
+    """
+    if label.cget("text") == text:
+        return False
+    label.config(text=text)
+    return True